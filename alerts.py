@@ -0,0 +1,125 @@
+import json
+import os
+import threading
+import time
+import numpy as np
+import requests
+from config import WIB_OFFSET
+from metrics import record_error, span
+from signals import determine_bias, h1_signal
+
+# ==========================================
+# ALERT SINYAL TERPUSAT (SATU EVALUASI PER BAR H1, DEDUP, TELEGRAM/WEBHOOK)
+# ==========================================
+
+TELEGRAM_URL = "https://api.telegram.org/bot{}/sendMessage"
+ALERT_HISTORY = 200   # kunci alert terakhir yang diingat untuk dedup
+ALERT_KINDS = ('signal', 'bias')
+
+def evaluate_closed_bar(h1):
+    """
+    Sinyal H1 & bias emas pada bar H1 terakhir yang sudah close (bar terakhir snapshot masih berjalan).
+    h1: hasil analisis timeframe H1 di snapshot; input bar close ada di h1['CLOSED'] (RSI dari state engine
+    indikator, perubahan DXY & yield bar itu), sama dengan yang dipakai dashboard & backtest untuk bar tersebut.
+    Return {'bar', 'signal', 'text', 'bias', 'price', 'dxy_c', 'rsi'} atau None.
+    """
+    closed = (h1 or {}).get('CLOSED')
+    if closed is None: return None
+    wib = closed['ts'] + WIB_OFFSET   # sumbu waktu chart korelasi = WIB
+    z = np.nan
+    if h1.get('CORR') and h1['CORR']['bias_z']:
+        zs = h1['CORR']['chart'].row(h1['CORR']['bias_z'])
+        i = int(np.searchsorted(zs.ts, wib))
+        if i < len(zs) and zs.ts[i] == wib: z = float(zs.values[i])
+    rsi = closed['rsi']; dxy_c = closed['dxy_c']
+    signal, text, _ = h1_signal(dxy_c, (rsi - 50) / 50)
+    bias, _ = determine_bias(dxy_c, closed['us10y_chg'], rsi, z=z)
+    return {'bar': time.strftime('%Y-%m-%d %H:%M', time.gmtime(wib)), 'signal': signal, 'text': text, 'bias': bias,
+            'price': closed['price'], 'dxy_c': dxy_c, 'rsi': rsi}
+
+def format_alert(alert):
+    label = "Sinyal H1" if alert['kind'] == 'signal' else "Bias"
+    return (f"MafaFX · {label} XAU/USD: {alert['from']} → {alert['to']}\n"
+            f"Bar close {alert['bar']} WIB · harga {alert['price']:,.2f} · DXY {alert['dxy_c']:+.2f}% · RSI {alert['rsi']:.0f}")
+
+class TelegramNotifier:
+    name = "TELEGRAM"
+
+    def __init__(self, token, chat_id, timeout=10):
+        self.token = token; self.chat_id = chat_id; self.timeout = timeout
+
+    def send(self, alert):
+        with span("upstream.telegram"):
+            r = requests.post(TELEGRAM_URL.format(self.token), json={'chat_id': self.chat_id, 'text': format_alert(alert)},
+                              timeout=self.timeout)
+        r.raise_for_status()
+
+class WebhookNotifier:
+    """POST JSON alert apa adanya (plus teks siap tampil) ke URL webhook."""
+    name = "WEBHOOK"
+
+    def __init__(self, url, timeout=10):
+        self.url = url; self.timeout = timeout
+
+    def send(self, alert):
+        with span("upstream.webhook"):
+            r = requests.post(self.url, json={**alert, 'text': format_alert(alert)}, timeout=self.timeout)
+        r.raise_for_status()
+
+class LocalNotifier:
+    """Pengganti lokal untuk testing: alert disimpan di memori dan (opsional) ditambahkan sebagai baris JSON ke file."""
+    name = "LOCAL"
+
+    def __init__(self, path=None):
+        self.path = path; self.sent = []
+
+    def send(self, alert):
+        self.sent.append(alert)
+        if self.path:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a") as f: f.write(json.dumps(alert, ensure_ascii=False) + "\n")
+
+class SignalAlerts:
+    """
+    Evaluator sinyal bersama. Dipanggil poller setelah snapshot baru dibangun (sudah single-flight antar proses),
+    mengevaluasi tiap bar H1 close sekali saja, lalu mengirim alert ke semua notifier saat sinyal/bias berubah.
+    Status & kunci alert terkirim disimpan di file agar restart atau proses lain tidak mengirim ulang.
+    """
+    def __init__(self, path, notifiers=()):
+        self.path = path; self.notifiers = list(notifiers)
+        self._lock = threading.Lock()
+
+    def _load(self):
+        try:
+            with open(self.path) as f: return json.load(f)
+        except (OSError, ValueError): return {'last': None, 'since': {}, 'sent': []}
+
+    def _save(self, state):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f: json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def process(self, snapshot):
+        """Evaluasi bar close terbaru bila belum pernah. Return status {'last', 'since'} untuk ditampilkan sesi."""
+        current = evaluate_closed_bar(snapshot['TF'].get('H1'))
+        with self._lock:
+            state = self._load()
+            last = state['last']
+            if current is None or (last and current['bar'] <= last['bar']):
+                return {'last': last, 'since': state['since']}
+            for kind in ALERT_KINDS:
+                if last is None or current[kind] != last[kind]: state['since'][kind] = current['bar']
+                if last is None or current[kind] == last[kind]: continue  # evaluasi pertama = baseline, tanpa alert
+                key = f"{kind}|{current['bar']}|{current[kind]}"
+                if key in state['sent']: continue
+                self._fan_out({**current, 'kind': kind, 'from': last[kind], 'to': current[kind], 'ts': time.time()})
+                state['sent'] = (state['sent'] + [key])[-ALERT_HISTORY:]
+            state['last'] = current
+            self._save(state)
+            return {'last': current, 'since': state['since']}
+
+    def _fan_out(self, alert):
+        for notifier in self.notifiers:
+            try: notifier.send(alert)
+            except Exception as e: record_error(notifier.name, e)
@@ -0,0 +1,74 @@
+import base64
+import hashlib
+import hmac
+import os
+import time
+import streamlit as st
+from config import DATA_DIR
+
+# ==========================================
+# TOKEN SESI (HMAC) & PENCABUTAN
+# ==========================================
+# Sengaja hanya stdlib + streamlit: dimuat di jalur login sebelum dashboard.
+
+TOKEN_TTL = 7 * 24 * 3600
+REVOKED_TOKENS_PATH = os.path.join(DATA_DIR, "revoked_tokens.txt")
+
+@st.cache_resource
+def get_token_secret():
+    try: return str(st.secrets["auth"]["token_secret"]).encode()
+    except: return b"MafaFX_Secure_Salt"
+
+def _sign_token(payload, password):
+    # Password ikut ditandatangani: ganti/hapus password user = semua tokennya otomatis batal
+    return hmac.new(get_token_secret(), f"{payload}::{password}".encode(), hashlib.sha256).hexdigest()
+
+def get_session_token(username, password, ttl=TOKEN_TTL):
+    """Token mandiri 'user_b64.expiry.signature', diverifikasi tanpa memindai semua user."""
+    user_b64 = base64.urlsafe_b64encode(username.encode()).decode().rstrip("=")
+    payload = f"{user_b64}.{int(time.time()) + ttl}"
+    return f"{payload}.{_sign_token(payload, password)}"
+
+@st.cache_resource
+def get_revoked_tokens():
+    return {'mtime': None, 'sigs': set()}
+
+def is_token_revoked(sig):
+    reg = get_revoked_tokens()
+    try: mtime = os.path.getmtime(REVOKED_TOKENS_PATH)
+    except OSError: mtime = None
+    if mtime != reg['mtime']:
+        sigs = set(); now = time.time()
+        try:
+            with open(REVOKED_TOKENS_PATH) as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) == 2 and int(parts[1]) > now: sigs.add(parts[0])
+        except (OSError, ValueError): pass
+        reg['sigs'] = sigs; reg['mtime'] = mtime
+    return sig in reg['sigs']
+
+def revoke_session_token(token):
+    try:
+        _, exp, sig = token.rsplit(".", 2)
+        os.makedirs(os.path.dirname(REVOKED_TOKENS_PATH), exist_ok=True)
+        with open(REVOKED_TOKENS_PATH, "a") as f: f.write(f"{sig} {int(exp)}\n")
+    except (ValueError, OSError): pass
+
+def verify_session_token(token, VALID_USERS):
+    """Return username bila token valid, belum kedaluwarsa, dan tidak dicabut; selain itu None."""
+    try:
+        user_b64, exp, sig = token.split(".")
+        user = base64.urlsafe_b64decode(user_b64 + "=" * (-len(user_b64) % 4)).decode()
+        if int(exp) < time.time() or user not in VALID_USERS: return None
+        if not hmac.compare_digest(_sign_token(f"{user_b64}.{exp}", VALID_USERS[user]), sig): return None
+        if is_token_revoked(sig): return None
+        return user
+    except: return None
+
+def logout():
+    token = st.query_params.get("auth_token")
+    if token: revoke_session_token(token)
+    st.session_state["password_correct"] = False
+    st.query_params.clear()
+    st.rerun()
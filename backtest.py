@@ -0,0 +1,178 @@
+import argparse
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from barstore import BarStore, format_ts
+from config import BARSTORE_PATH, GOLD_SYMBOL, USD_PROXY
+from engine import get_twelvedata
+from indicators import rsi_series
+from signals import bias_score, signal_direction
+
+# ==========================================
+# BACKTEST & SWEEP PARAMETER (VEKTOR, MULTI-PROSES)
+# ==========================================
+# Contoh:
+#   python backtest.py --backfill --api-key KEY --years 10   (isi riwayat H1 ke bar store dulu)
+#   python backtest.py --years 10 --workers 8 --out sweep.csv
+
+INTERVAL = "1h"
+BAR_SECONDS = 3600
+
+# Grid bawaan: 'bias' = aturan determine_bias, 'signal' = aturan sinyal H1 di dashboard.
+# rsi_band b -> RSI > 50 + b bullish, RSI < 50 - b bearish (dashboard: b = 10).
+BIAS_GRID = {
+    'dxy': [0.02, 0.03, 0.05, 0.08, 0.1],
+    'us10y': [0.25, 0.5, 0.75, 1.0],
+    'rsi_band': [5, 10, 15],
+    'rsi_period': [7, 14, 21],
+    'strong': [2, 3, 4],
+    'horizon': [1, 4],
+}
+# strength = filter net_score (RSI-50)/50 untuk sinyal "KUAT"; -1 = tanpa filter.
+SIGNAL_GRID = {
+    'dxy': [0.02, 0.03, 0.05, 0.08, 0.1],
+    'strength': [-1.0, 0.0, 0.2, 0.4],
+    'rsi_period': [7, 14, 21],
+    'horizon': [1, 4, 8],
+}
+
+def prepare_data(gold, usd_proxy, us10y=None, rsi_periods=(14,), horizons=(1,)):
+    """
+    Selaraskan bar H1 emas & proxy USD (inner join) plus yield US10Y (asof pada waktu close bar,
+    tanpa look-ahead). Semua seri yang dipakai evaluate() dihitung sekali di sini.
+    """
+    df = pd.concat({'gold': gold['close'], 'usd': usd_proxy['close']}, axis=1).dropna()
+    close = df['gold'].to_numpy(dtype=float); usd = df['usd'].to_numpy(dtype=float)
+    dxy_chg = np.concatenate(([0.0], -np.diff(usd) / usd[:-1] * 100))
+    us10y_chg = np.zeros(len(df))
+    if us10y is not None and len(us10y):
+        # index bar = waktu mulai, index yield = waktu close: baca yield asof close bar (sama dengan aligned_returns)
+        y = us10y.sort_index().asof(df.index + pd.Timedelta(seconds=BAR_SECONDS)).to_numpy(dtype=float)
+        us10y_chg = np.nan_to_num(np.concatenate(([0.0], np.diff(y) / y[:-1] * 100)))
+    periods = sorted(set(rsi_periods))
+    return {
+        'index': df.index, 'close': close, 'dxy_chg': dxy_chg, 'us10y_chg': us10y_chg,
+        'rsi': dict(zip(periods, rsi_series(close, periods))),
+        'r1': np.concatenate(([0.0], np.diff(close) / close[:-1])),
+        'fwd': {h: np.concatenate((close[h:] / close[:-h] - 1, np.full(h, np.nan))) for h in sorted(set(horizons))},
+    }
+
+def positions(rule, params, data):
+    """Posisi (k, n): +1 long, -1 short, 0 flat untuk k set parameter sekaligus."""
+    rsi = np.stack([data['rsi'][p] for p in params['rsi_period']])
+    col = lambda name: params[name].to_numpy(dtype=float)[:, None]
+    if rule == 'bias':
+        band = col('rsi_band')
+        score = bias_score(data['dxy_chg'], data['us10y_chg'], rsi, 1, col('dxy'), col('us10y'), 50 + band, 50 - band)
+        strong = col('strong')
+        return np.where(score >= strong, 1, np.where(score <= -strong, -1, 0)).astype(np.int8)
+    direction = signal_direction(data['dxy_chg'], col('dxy'))
+    net = (rsi - 50) / 50; strength = col('strength')
+    return np.where((direction > 0) & (net > strength), 1, np.where((direction < 0) & (net < -strength), -1, 0)).astype(np.int8)
+
+def evaluate(rule, params, data, cost=0.0):
+    """
+    Metrik per set parameter. Hit rate & expectancy memakai return `horizon` bar sejak close bar sinyal;
+    equity & drawdown memakai posisi yang dipegang 1 bar, dikurangi `cost` (%) per perubahan posisi.
+    """
+    pos = positions(rule, params, data)
+    fwd = np.stack([data['fwd'][h] for h in params['horizon']])
+    trade = (pos != 0) & ~np.isnan(fwd)
+    pnl = np.where(trade, pos * np.nan_to_num(fwd), 0.0)
+    trades = trade.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        hit = ((pnl > 0) & trade).sum(axis=1) / trades
+        expectancy = pnl.sum(axis=1) / trades * 100
+    turnover = np.abs(np.diff(pos, axis=1, prepend=0))
+    bar_pnl = np.zeros(pos.shape)
+    bar_pnl[:, 1:] = pos[:, :-1] * data['r1'][None, 1:]
+    equity = np.cumsum(bar_pnl * 100 - cost * turnover, axis=1)
+    drawdown = (np.maximum.accumulate(equity, axis=1) - equity).max(axis=1)
+    out = params.reset_index(drop=True).copy()
+    out.insert(0, 'rule', rule)
+    out['trades'] = trades; out['hit_rate'] = hit; out['expectancy_pct'] = expectancy
+    out['total_pct'] = equity[:, -1]; out['max_dd_pct'] = drawdown
+    return out
+
+_DATA = None
+
+def _init_worker(data):
+    global _DATA
+    _DATA = data
+
+def _run_chunk(args):
+    rule, params, cost = args
+    return evaluate(rule, params, _DATA, cost)
+
+def sweep(data, grids, workers=None, chunk=32, cost=0.0):
+    """Grid sweep paralel: tiap worker menerima data sekali (initializer), lalu mengevaluasi potongan grid."""
+    jobs = []
+    for rule, grid in grids.items():
+        params = pd.DataFrame(list(itertools.product(*grid.values())), columns=list(grid))
+        jobs += [(rule, params.iloc[i:i + chunk], cost) for i in range(0, len(params), chunk)]
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(data,)) as pool:
+        parts = list(pool.map(_run_chunk, jobs))
+    return pd.concat(parts, ignore_index=True)
+
+def backfill(store, symbols, api_key, years, pause=8.0):
+    """Isi riwayat H1 mundur (end_date = bar tertua di store) sampai `years` tahun ke belakang."""
+    target = time.time() - years * 365.25 * 86400
+    for symbol in symbols:
+        while True:
+            first = store.first_ts(symbol, INTERVAL)
+            if first is not None and first <= target: break
+            query = {'outputsize': 5000}
+            if first is not None: query['end_date'] = format_ts(first - BAR_SECONDS)
+            values = (get_twelvedata([symbol], INTERVAL, api_key, timeout=30, **query) or {}).get(symbol)
+            if not values: break
+            store.upsert(symbol, INTERVAL, values)
+            print(f"{symbol}: +{len(values)} bar (mulai {values[-1]['datetime']})")
+            time.sleep(pause)  # batas rate API
+
+def load_us10y():
+    """Yield ^TNX H1 dari yfinance (maks. ~730 hari), index = waktu close bar (UTC naive)."""
+    import yfinance as yf
+    df = yf.Ticker("^TNX").history(period="730d", interval="1h")
+    if df.empty: return None
+    idx = df.index.tz_convert("UTC").tz_localize(None) + pd.Timedelta(seconds=BAR_SECONDS)
+    return pd.Series(df['Close'].to_numpy(), index=idx)
+
+def main():
+    ap = argparse.ArgumentParser(description="Backtest & sweep parameter bias/sinyal H1 MafaFX.")
+    ap.add_argument("--db", default=BARSTORE_PATH)
+    ap.add_argument("--years", type=float, default=10)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--cost", type=float, default=0.0, help="biaya per perubahan posisi, dalam %%")
+    ap.add_argument("--min-trades", type=int, default=30)
+    ap.add_argument("--top", type=int, default=20)
+    ap.add_argument("--out", default=None, help="simpan semua hasil ke CSV")
+    ap.add_argument("--no-us10y", action="store_true", help="jangan unduh US10Y (skor yield = 0)")
+    ap.add_argument("--backfill", action="store_true")
+    ap.add_argument("--api-key", default=os.environ.get("TWELVEDATA_API_KEY"))
+    args = ap.parse_args()
+
+    store = BarStore(args.db)
+    if args.backfill: backfill(store, [GOLD_SYMBOL, USD_PROXY], args.api_key, args.years)
+    since = pd.Timestamp.now(tz="UTC").tz_localize(None) - pd.Timedelta(days=365.25 * args.years)
+    gold = store.load(GOLD_SYMBOL, INTERVAL).loc[since:]
+    usd = store.load(USD_PROXY, INTERVAL).loc[since:]
+    us10y = None if args.no_us10y else load_us10y()
+
+    grids = {'bias': BIAS_GRID, 'signal': SIGNAL_GRID}
+    t0 = time.perf_counter()
+    data = prepare_data(gold, usd, us10y,
+                        rsi_periods={p for g in grids.values() for p in g['rsi_period']},
+                        horizons={h for g in grids.values() for h in g['horizon']})
+    res = sweep(data, grids, args.workers, cost=args.cost)
+    elapsed = time.perf_counter() - t0
+    print(f"{len(res)} kombinasi x {len(data['close'])} bar H1 ({data['index'][0]} s/d {data['index'][-1]}) dalam {elapsed:.1f} detik")
+    best = res[res['trades'] >= args.min_trades].sort_values('expectancy_pct', ascending=False)
+    with pd.option_context('display.width', 200, 'display.max_columns', 20):
+        print(best.head(args.top).to_string(index=False))
+    if args.out: res.to_csv(args.out, index=False)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+import os
+import sqlite3
+import threading
+import numpy as np
+import pandas as pd
+
+# ==========================================
+# PENYIMPANAN BAR OHLC (SQLITE, INKREMENTAL)
+# ==========================================
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bars (
+    symbol TEXT NOT NULL, interval TEXT NOT NULL, ts INTEGER NOT NULL,
+    open REAL, high REAL, low REAL, close REAL, volume REAL,
+    PRIMARY KEY (symbol, interval, ts)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS gaps_checked (
+    symbol TEXT NOT NULL, interval TEXT NOT NULL, start INTEGER NOT NULL, stop INTEGER NOT NULL,
+    PRIMARY KEY (symbol, interval, start)
+) WITHOUT ROWID;
+"""
+
+INTERVAL_SECONDS = {
+    '1min': 60, '5min': 300, '15min': 900, '30min': 1800,
+    '1h': 3600, '4h': 14400, '1day': 86400, '1week': 604800,
+}
+
+COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+def to_epoch(datetimes):
+    """String/Timestamp (UTC, naive) -> detik epoch (int64)."""
+    dt = pd.to_datetime(pd.Series(datetimes))
+    return ((dt - pd.Timestamp("1970-01-01")) // pd.Timedelta("1s")).to_numpy(dtype=np.int64)
+
+def format_ts(ts):
+    """Detik epoch -> format tanggal yang diterima parameter start_date/end_date Twelve Data."""
+    return pd.Timestamp(int(ts), unit='s').strftime('%Y-%m-%d %H:%M:%S')
+
+def market_closed(ts):
+    """Jam tutup pasar FX/metal (UTC): Jumat 21:00 s/d Minggu 22:00."""
+    dt = pd.Timestamp(int(ts), unit='s')
+    wd, hour = dt.weekday(), dt.hour
+    return wd == 5 or (wd == 4 and hour >= 21) or (wd == 6 and hour < 22)
+
+class BarStore:
+    """
+    Riwayat OHLC lengkap per (symbol, interval). Thread-safe di dalam satu proses;
+    antar proses memakai mode WAL SQLite.
+    """
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def last_ts(self, symbol, interval):
+        with self._lock:
+            row = self._conn.execute("SELECT MAX(ts) FROM bars WHERE symbol=? AND interval=?", (symbol, interval)).fetchone()
+        return row[0]
+
+    def first_ts(self, symbol, interval):
+        with self._lock:
+            row = self._conn.execute("SELECT MIN(ts) FROM bars WHERE symbol=? AND interval=?", (symbol, interval)).fetchone()
+        return row[0]
+
+    def upsert(self, symbol, interval, values):
+        """Simpan list 'values' Twelve Data. Bar yang sudah ada (mis. bar terakhir yang belum close) ditimpa."""
+        if not values: return 0
+        df = pd.DataFrame(values)
+        ts = to_epoch(df['datetime'])
+        cols = [df[c].astype(float).to_numpy() if c in df else np.zeros(len(df)) for c in COLUMNS]
+        rows = [(symbol, interval, int(t), *map(float, r)) for t, *r in zip(ts, *cols)]
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO bars VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def load(self, symbol, interval, limit=None):
+        """DataFrame bar urut naik (index datetime UTC naive), maksimal `limit` bar terakhir."""
+        q = "SELECT ts, open, high, low, close, volume FROM bars WHERE symbol=? AND interval=? ORDER BY ts DESC"
+        args = (symbol, interval)
+        if limit: q += " LIMIT ?"; args += (int(limit),)
+        with self._lock:
+            rows = self._conn.execute(q, args).fetchall()
+        arr = np.array(rows[::-1], dtype=float).reshape(-1, 6)
+        idx = pd.DatetimeIndex(pd.to_datetime(arr[:, 0].astype(np.int64), unit='s'), name='datetime')
+        return pd.DataFrame(arr[:, 1:], index=idx, columns=COLUMNS)
+
+    def load_frame(self, symbols, interval, limit=None):
+        """Frame kolumnar untuk banyak simbol: kolom (field, symbol), digabung pada index waktu."""
+        frames = {s: self.load(s, interval, limit) for s in symbols}
+        return pd.concat(frames, axis=1).swaplevel(axis=1).sort_index(axis=1)
+
+    def _all_gaps(self, symbol, interval):
+        step = INTERVAL_SECONDS[interval]
+        with self._lock:
+            ts = np.array([r[0] for r in self._conn.execute(
+                "SELECT ts FROM bars WHERE symbol=? AND interval=? ORDER BY ts", (symbol, interval))], dtype=np.int64)
+        if len(ts) < 2: return []
+        out = []
+        for i in np.nonzero(np.diff(ts) > step)[0]:
+            start, stop = int(ts[i]), int(ts[i + 1])
+            # Celah akhir pekan/jam tutup bukan data hilang
+            if all(market_closed(t) for t in range(start + step, stop, step)): continue
+            out.append((start, stop))
+        return out
+
+    def gaps(self, symbol, interval):
+        """Celah di tengah riwayat yang belum pernah dicoba backfill."""
+        with self._lock:
+            checked = {r[0] for r in self._conn.execute(
+                "SELECT start FROM gaps_checked WHERE symbol=? AND interval=?", (symbol, interval))}
+        return [g for g in self._all_gaps(symbol, interval) if g[0] not in checked]
+
+    def mark_checked(self, symbol, interval, gaps):
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR IGNORE INTO gaps_checked VALUES (?, ?, ?, ?)",
+                                   [(symbol, interval, start, stop) for start, stop in gaps])
@@ -0,0 +1,298 @@
+import argparse
+import gzip
+import json
+import os
+import pickle
+import shutil
+import subprocess
+import statistics
+import sys
+import tempfile
+import time
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+import requests
+import yfinance as yf
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from barstore import BarStore, to_epoch
+from calendarstore import CALENDAR_URL, CalendarStore, parse_calendar, wib_day
+from charts import build_correlation_figure
+from config import (BAR_LOOKBACK, CHART_RANGES, CORR_WINDOWS, GOLD_SYMBOL, INDICATOR_CONFIG, TF_ORIGIN, TIMEFRAMES,
+                    USD_PROXY, WATCHLIST)
+from indicators import IndicatorEngine, rolling_stats
+from levels import SessionLevels, key_levels, last_closed
+from signals import determine_bias, usd_sign
+import engine
+
+# ==========================================
+# BENCHMARK OFFLINE (FIXTURE REKAMAN, TANPA JARINGAN)
+# ==========================================
+# Contoh:
+#   python bench/run.py                      (bandingkan dengan baseline.json, exit 1 bila regresi)
+#   python bench/run.py --update-baseline    (simpan hasil sebagai baseline baru)
+#   python bench/run.py --record --api-key KEY   (rekam ulang fixture dari API asli)
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES = os.path.join(BENCH_DIR, "fixtures")
+BARS_FIXTURE = os.path.join(FIXTURES, "twelvedata_{interval}.json.gz")
+INTERVALS = ("1h", "15min")
+NEWS_FIXTURE = os.path.join(FIXTURES, "ff_calendar_thisweek.csv")
+TNX_FIXTURE = os.path.join(FIXTURES, "tnx_1h.csv")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+
+CHART_BARS = max(CHART_RANGES)
+MTF_RULES = [rule for _, rule in TIMEFRAMES.values() if rule]
+
+# Modul yang tidak boleh ikut termuat di jalur login (cold start tanpa autentikasi)
+LOGIN_FORBIDDEN = ('pandas', 'yfinance', 'dashboard', 'engine', 'barstore', 'charts')
+
+STARTUP_CODE = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+before = set(sys.modules)
+at = AppTest.from_file({app!r}, default_timeout=120)
+at.secrets["passwords"] = {{"bench": "bench"}}
+at.secrets["twelvedata"] = {{"api_key": "fixture"}}
+if {authed}: at.session_state["password_correct"] = True
+at.run()
+loaded = sorted({{m.split(".")[0] for m in set(sys.modules) - before}})
+print(json.dumps({{"error": at.exception[0].value if at.exception else None, "loaded": loaded}}))
+"""
+
+# Regresi = median > baseline * (1 + tolerance) DAN selisihnya > MIN_DELTA (noise timer di tahap mikro)
+TOLERANCE = 0.5
+MIN_DELTA = 0.002
+
+# ------------------------------------------
+# Rekam fixture
+# ------------------------------------------
+
+def record(api_key):
+    """Rekam respons asli Twelve Data (batch), kalender ForexFactory, dan ^TNX ke folder fixtures."""
+    os.makedirs(FIXTURES, exist_ok=True)
+    for interval in INTERVALS:
+        r = requests.get(engine.TWELVEDATA_URL, timeout=60, params={
+            'symbol': ",".join(WATCHLIST), 'interval': interval, 'apikey': api_key, 'outputsize': 5000, 'timezone': 'UTC'})
+        r.raise_for_status()
+        with gzip.open(BARS_FIXTURE.format(interval=interval), "wt") as f: json.dump(r.json(), f)
+    r = requests.get(CALENDAR_URL, timeout=30); r.raise_for_status()
+    with open(NEWS_FIXTURE, "w") as f: f.write(r.text)
+    yf.Ticker("^TNX").history(period="5d", interval="1h").to_csv(TNX_FIXTURE)
+    print(f"fixture direkam ke {FIXTURES}")
+
+# ------------------------------------------
+# Stub upstream (requests.get & yfinance.Ticker dibaca dari fixture)
+# ------------------------------------------
+
+class FixtureResponse:
+    def __init__(self, payload=None, text=""):
+        self._payload = payload; self.text = text; self.status_code = 200; self.headers = {}
+
+    def json(self):
+        return json.loads(json.dumps(self._payload))  # salinan baru, seperti decode respons asli
+
+    def raise_for_status(self):
+        pass
+
+class FixtureTicker:
+    def __init__(self, symbol):
+        self.symbol = symbol
+
+    def history(self, *args, **kwargs):
+        df = pd.read_csv(TNX_FIXTURE, index_col=0)
+        df.index = pd.to_datetime(df.index, utc=True)
+        return df
+
+class Upstream:
+    """Pengganti requests.get untuk Twelve Data (symbol/interval/outputsize/start_date/end_date) & ForexFactory."""
+    def __init__(self):
+        self.bars = {}
+        for interval in INTERVALS:
+            with gzip.open(BARS_FIXTURE.format(interval=interval), "rt") as f: self.bars[interval] = json.load(f)
+        with open(NEWS_FIXTURE) as f: self.news = f.read()
+        self.calls = 0
+
+    def get(self, url, params=None, timeout=None, **kwargs):
+        self.calls += 1
+        if url == CALENDAR_URL: return FixtureResponse(text=self.news)
+        query = {k: v[0] for k, v in parse_qs(urlparse(url).query).items()}
+        query.update(params or {})
+        symbols = query['symbol'].split(",")
+        out = {s: self._series(s, query) for s in symbols}
+        return FixtureResponse(out[symbols[0]] if len(symbols) == 1 else out)
+
+    def _series(self, symbol, query):
+        bars = self.bars.get(query.get('interval', '1h'), {})
+        if symbol not in bars: return {'code': 400, 'status': 'error', 'message': f'{symbol} {query.get("interval")} tidak ada di fixture'}
+        values = bars[symbol]['values']
+        if 'start_date' in query: values = [v for v in values if v['datetime'] >= query['start_date']]
+        if 'end_date' in query: values = [v for v in values if v['datetime'] <= query['end_date']]
+        values = values[:int(query.get('outputsize', 30))]
+        return {'meta': bars[symbol].get('meta', {'symbol': symbol}), 'values': values, 'status': 'ok'}
+
+    def install(self):
+        requests.get = self.get
+        yf.Ticker = FixtureTicker
+
+# ------------------------------------------
+# Tahap yang diukur
+# ------------------------------------------
+
+def timeit(fn, repeat):
+    fn()  # pemanasan
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter(); fn(); samples.append(time.perf_counter() - t0)
+    return statistics.median(samples)
+
+def bench_stages(workdir, repeat):
+    api_key = "fixture"
+    got = engine.get_twelvedata(WATCHLIST, "1h", api_key, outputsize=5000)
+    store = BarStore(os.path.join(workdir, "bench.sqlite"))
+    for s in WATCHLIST: store.upsert(s, "1h", got[s])
+    bars = store.load_frame(WATCHLIST, "1h", BAR_LOOKBACK)
+    history = store.load_frame(WATCHLIST, "1h")
+    _, gold_ret, dxy_ret, _ = engine.aligned_returns(history, GOLD_SYMBOL, USD_PROXY)
+    gold = bars.xs(GOLD_SYMBOL, axis=1, level=1).dropna()
+    px = engine.process_data(bars, inverse=(USD_PROXY,), keep=CHART_BARS)
+    with open(NEWS_FIXTURE) as f: news = f.read()
+    calendar = CalendarStore(os.path.join(workdir, "calendar.json")); calendar.sync(min_interval=0)
+    day = wib_day(calendar.next_event(0)['ts'])
+    hlc = [bars[f][WATCHLIST].to_numpy() for f in ('high', 'low', 'close')]
+    ts = to_epoch(bars.index)
+    now = int(ts[-1]) + 3600
+    daily = engine.resample_bars(bars, '24h', origin=TF_ORIGIN)   # periode acuan pivot intraday
+    daily_hlc = [daily[f][WATCHLIST].to_numpy() for f in ('high', 'low', 'close')]
+    daily_end = to_epoch(daily.index + pd.Timedelta(hours=24))
+    n = len(WATCHLIST)
+    dxy_chg = np.full(n, px['c'][USD_PROXY]); us10y_chg = np.full(n, 0.1)
+    rsi = np.linspace(30, 70, n); sign = np.array([usd_sign(s) for s in WATCHLIST])
+
+    stages = {
+        'fetch_bars': lambda: engine.get_twelvedata(WATCHLIST, "1h", api_key, outputsize=5000),
+        'store_upsert': lambda: [store.upsert(s, "1h", got[s]) for s in WATCHLIST],
+        'store_load_frame': lambda: store.load_frame(WATCHLIST, "1h", BAR_LOOKBACK),
+        'process_data': lambda: engine.process_data(bars, inverse=(USD_PROXY,), keep=CHART_BARS),
+        'calculate_rsi': lambda: engine.calculate_rsi(gold['close'].values),
+        'indicators_compute': lambda: IndicatorEngine(**INDICATOR_CONFIG).compute(gold['high'].values, gold['low'].values, gold['close'].values),
+        'key_levels': lambda: key_levels(*hlc, last_closed(*daily_hlc, daily_end, now), atr=np.ones(n)),
+        'session_levels': lambda: SessionLevels().update(ts, hlc[0], hlc[1], WATCHLIST, now),  # miss: sesi baru close
+        'resample_mtf': lambda: [engine.resample_bars(history, rule, origin=TF_ORIGIN) for rule in MTF_RULES],
+        'parse_calendar': lambda: parse_calendar(news),
+        'calendar_lookup': lambda: (calendar.day(day), calendar.next_event(0)),
+        'rolling_stats': lambda: rolling_stats(dxy_ret, gold_ret, CORR_WINDOWS['H1']),
+        'determine_bias': lambda: determine_bias(dxy_chg, us10y_chg, rsi, sign),
+        'build_figure': lambda: build_correlation_figure(px['chart'][GOLD_SYMBOL], px['ret'][USD_PROXY] * 100),
+    }
+    return {name: timeit(fn, repeat) for name, fn in stages.items()}
+
+def bench_render(workdir, repeat):
+    """Render penuh main() lewat AppTest: cold = data dir & cache kosong (termasuk seed bar), warm = rerun."""
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    def app_test():
+        at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=120)
+        at.secrets["passwords"] = {"bench": "bench"}
+        at.secrets["twelvedata"] = {"api_key": "fixture"}
+        at.session_state["password_correct"] = True
+        return at
+
+    def check(at):
+        if at.exception: raise RuntimeError(f"render gagal: {at.exception[0].value}")
+        return at
+
+    cold, warm = [], []
+    for i in range(repeat):
+        os.environ["MAFAFX_DATA_DIR"] = os.path.join(workdir, f"render-{i}")
+        st.cache_data.clear(); st.cache_resource.clear()
+        for module in ('app', 'config', 'auth', 'dashboard'): sys.modules.pop(module, None)  # path data dibaca ulang saat import
+        at = app_test()
+        t0 = time.perf_counter(); check(at.run()); cold.append(time.perf_counter() - t0)
+        t0 = time.perf_counter(); check(at.run()); warm.append(time.perf_counter() - t0)
+    # Snapshot bersama dibaca ulang tiap worker setiap kali berubah
+    with open(os.path.join(workdir, "render-0", "snapshot.pkl"), "rb") as f: raw = f.read()
+    return {'render_cold': statistics.median(cold), 'render_warm': statistics.median(warm),
+            'snapshot_load': timeit(lambda: pickle.loads(raw), 20)}
+
+def bench_startup(data_dir, repeat):
+    """
+    Cold start di interpreter baru (start proses s/d render pertama selesai): halaman login, dan
+    dashboard yang membaca snapshot bersama yang sudah segar di `data_dir` (tanpa fetch upstream).
+    """
+    env = {**os.environ, 'MAFAFX_DATA_DIR': data_dir}
+    out = {}
+    for name, authed in [('startup_login', False), ('startup_dashboard', True)]:
+        samples = []
+        for _ in range(repeat):
+            code = STARTUP_CODE.format(app=os.path.join(ROOT, "app.py"), authed=authed)
+            t0 = time.perf_counter()
+            proc = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True, timeout=300)
+            samples.append(time.perf_counter() - t0)
+            result = json.loads(proc.stdout.strip().splitlines()[-1])
+            if result['error']: raise RuntimeError(f"{name} gagal: {result['error']}")
+            heavy = [m for m in LOGIN_FORBIDDEN if m in result['loaded']]
+            if not authed and heavy: raise RuntimeError(f"jalur login memuat modul berat: {', '.join(heavy)}")
+        out[name] = statistics.median(samples)
+    return out
+
+# ------------------------------------------
+# Baseline
+# ------------------------------------------
+
+def compare(results, baseline, tolerance):
+    """Cetak tabel hasil vs baseline. Return daftar tahap yang regresi."""
+    regressed = []
+    print(f"{'tahap':<22}{'median (ms)':>13}{'baseline (ms)':>15}{'rasio':>8}")
+    for name, t in results.items():
+        base = baseline.get(name)
+        ratio = t / base if base else float('nan')
+        bad = base is not None and t > base * (1 + tolerance) and t - base > MIN_DELTA
+        if bad: regressed.append(name)
+        print(f"{name:<22}{t * 1e3:>13.2f}{(base or float('nan')) * 1e3:>15.2f}{ratio:>8.2f}{'  REGRESI' if bad else ''}")
+    return regressed
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark offline tahap data & render dashboard MafaFX.")
+    ap.add_argument("--repeat", type=int, default=20, help="ulangan per tahap (median)")
+    ap.add_argument("--render-repeat", type=int, default=3, help="ulangan render penuh")
+    ap.add_argument("--tolerance", type=float, default=TOLERANCE, help="batas regresi relatif (0.5 = +50%%)")
+    ap.add_argument("--no-render", action="store_true", help="lewati render penuh AppTest (dan cold start)")
+    ap.add_argument("--startup-repeat", type=int, default=3, help="ulangan cold start per jalur")
+    ap.add_argument("--update-baseline", action="store_true")
+    ap.add_argument("--record", action="store_true", help="rekam ulang fixture dari API asli (butuh jaringan)")
+    ap.add_argument("--api-key", default=os.environ.get("TWELVEDATA_API_KEY"))
+    args = ap.parse_args()
+
+    if args.record: return record(args.api_key)
+
+    upstream = Upstream(); upstream.install()
+    workdir = tempfile.mkdtemp(prefix="mafafx-bench-")
+    try:
+        results = bench_stages(workdir, args.repeat)
+        if not args.no_render:
+            results.update(bench_render(workdir, args.render_repeat))
+            results.update(bench_startup(os.path.join(workdir, "render-0"), args.startup_repeat))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    baseline = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f: baseline = json.load(f)
+    regressed = compare(results, baseline, args.tolerance)
+    if args.update_baseline:
+        with open(BASELINE_PATH, "w") as f: json.dump({**baseline, **results}, f, indent=2, sort_keys=True)
+        print(f"baseline disimpan ke {BASELINE_PATH}")
+        return 0
+    if regressed:
+        print(f"REGRESI: {', '.join(regressed)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+import io
+import json
+import os
+import threading
+import time
+import numpy as np
+import pandas as pd
+import requests
+from config import WIB_OFFSET
+from metrics import span
+
+# ==========================================
+# KALENDER EKONOMI (CONDITIONAL GET, DISK, INDEKS PER HARI)
+# ==========================================
+
+CALENDAR_URL = "https://nfs.faireconomy.media/ff_calendar_thisweek.csv"
+FEED_UTC_OFFSET = 4 * 3600   # jam di CSV = UTC-4 (WIB = jam CSV + 11 jam)
+FIELDS = ['ts', 'currency', 'impact', 'title', 'forecast', 'previous']
+
+def parse_calendar(text):
+    """
+    CSV ForexFactory -> kolom ringkas semua event (semua mata uang & impact), urut waktu.
+    ts = epoch UTC (NaN untuk event tanpa jam, mis. "All Day").
+    """
+    df = pd.read_csv(io.StringIO(text), dtype=str, keep_default_na=False)
+    dt = pd.to_datetime(df['Date'] + ' ' + df['Time'], format='%m-%d-%Y %I:%M%p', errors='coerce')
+    ts = ((dt - pd.Timestamp("1970-01-01")) / pd.Timedelta("1s")).to_numpy(dtype=float) + FEED_UTC_OFFSET
+    order = np.argsort(ts, kind='stable')
+    cols = {'ts': ts, 'currency': df['Country'], 'impact': df['Impact'], 'title': df['Title'],
+            'forecast': df['Forecast'], 'previous': df['Previous']}
+    return {k: np.asarray(v, dtype=float if k == 'ts' else object)[order] for k, v in cols.items()}
+
+def wib_day(ts):
+    """Epoch UTC -> tanggal WIB 'YYYY-MM-DD'."""
+    return time.strftime('%Y-%m-%d', time.gmtime(ts + WIB_OFFSET))
+
+def day_index(ts):
+    """Tanggal WIB -> indeks event (urut waktu); event tanpa jam tidak diindeks."""
+    by_day = {}
+    for i, t in enumerate(ts):
+        if t == t: by_day.setdefault(wib_day(t), []).append(i)
+    return {d: np.array(idx) for d, idx in by_day.items()}
+
+class CalendarStore:
+    """
+    Kalender minggu ini: disimpan sekali dalam bentuk kolumnar (sudah diparse) di file JSON yang dibagi
+    antar proses, direvalidasi dengan conditional GET (ETag/Last-Modified). Lookup harian lewat indeks
+    per tanggal WIB; filter mata uang/impact dilakukan saat lookup, jadi ganti mata uang tidak perlu unduh ulang.
+    """
+    def __init__(self, path, url=CALENDAR_URL):
+        self.path = path; self.url = url
+        self._lock = threading.Lock()
+        self._mtime = 0.0
+        self.meta = {'etag': None, 'last_modified': None, 'checked': 0.0}
+        # (kolom event, indeks per hari) diganti sekaligus agar lookup tanpa lock selalu konsisten
+        self._state = ({k: np.array([], dtype=float if k == 'ts' else object) for k in FIELDS}, {})
+        self._load()
+
+    def __len__(self):
+        return len(self._state[0]['ts'])
+
+    def _load(self):
+        try:
+            mtime = os.path.getmtime(self.path)
+            if mtime <= self._mtime: return
+            with open(self.path) as f: data = json.load(f)
+            events = {k: np.array(data['events'][k], dtype=float if k == 'ts' else object) for k in FIELDS}
+            self._state = (events, day_index(events['ts']))
+            self.meta = data['meta']; self._mtime = mtime
+        except (OSError, ValueError, KeyError): pass
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        data = {'meta': self.meta, 'events': {k: v.tolist() for k, v in self._state[0].items()}}
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f: json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp, self.path)
+        self._mtime = os.path.getmtime(self.path)
+
+    def expire(self):
+        """Paksa revalidasi pada sync() berikutnya (tetap conditional GET)."""
+        with self._lock: self.meta['checked'] = 0.0
+
+    def sync(self, timeout=10, min_interval=900):
+        """
+        Revalidasi bila pemeriksaan terakhir (proses mana pun) lebih lama dari `min_interval`.
+        304 = tidak berubah, tanpa parse ulang. Return True bila isi kalender berubah, False bila tidak,
+        None bila belum due (tanpa request upstream).
+        """
+        with self._lock:
+            self._load()
+            if time.time() - self.meta['checked'] < min_interval: return None
+            headers = {}
+            if self.meta['etag']: headers['If-None-Match'] = self.meta['etag']
+            if self.meta['last_modified']: headers['If-Modified-Since'] = self.meta['last_modified']
+            with span("upstream.forexfactory"): r = requests.get(self.url, headers=headers, timeout=timeout)
+            changed = r.status_code != 304
+            if changed:
+                r.raise_for_status()
+                with span("parse.calendar"):
+                    events = parse_calendar(r.text)
+                    self._state = (events, day_index(events['ts']))
+                self.meta['etag'] = r.headers.get('ETag'); self.meta['last_modified'] = r.headers.get('Last-Modified')
+            self.meta['checked'] = time.time()
+            self._save()
+            return changed
+
+    @staticmethod
+    def _select(e, idx, currencies, impacts):
+        return idx[np.isin(e['currency'][idx], list(currencies)) & np.isin(e['impact'][idx], list(impacts))]
+
+    @staticmethod
+    def _frame(e, idx):
+        wib = pd.to_datetime(e['ts'][idx] + WIB_OFFSET, unit='s')
+        return pd.DataFrame({'WIB': wib, 'Country': e['currency'][idx], 'Impact': e['impact'][idx], 'Title': e['title'][idx],
+                             'Forecast': e['forecast'][idx], 'Previous': e['previous'][idx]})
+
+    def day(self, date, currencies=('USD',), impacts=('High', 'Medium')):
+        """Event pada tanggal WIB `date` ('YYYY-MM-DD'), urut waktu."""
+        e, by_day = self._state
+        return self._frame(e, self._select(e, by_day.get(date, np.array([], dtype=int)), currencies, impacts))
+
+    def week(self, currencies=('USD',), impacts=('High', 'Medium')):
+        e = self._state[0]
+        return self._frame(e, self._select(e, np.arange(len(e['ts'])), currencies, impacts))
+
+    def next_event(self, now, currencies=('USD',), impacts=('High', 'Medium')):
+        """Event berikutnya setelah `now` (epoch): {'ts', 'currency', 'impact', 'title'} atau None."""
+        if self._lock.acquire(blocking=False):  # ambil hasil sync proses lain; jangan tunggu sync yang sedang jalan
+            try: self._load()
+            finally: self._lock.release()
+        e = self._state[0]
+        start = int(np.searchsorted(e['ts'], now, side='right'))  # NaN (tanpa jam) ada di ujung array
+        idx = self._select(e, np.arange(start, len(e['ts'])), currencies, impacts)
+        idx = idx[~np.isnan(e['ts'][idx])]
+        if not len(idx): return None
+        i = idx[0]
+        return {'ts': float(e['ts'][i]), 'currency': e['currency'][i], 'impact': e['impact'][i], 'title': e['title'][i]}
@@ -0,0 +1,62 @@
+import numpy as np
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+# ==========================================
+# CHART & DOWNSAMPLING
+# ==========================================
+
+CHART_MAX_POINTS = 300
+
+def lttb(y, n_out):
+    """
+    Indeks titik hasil Largest-Triangle-Three-Buckets (x = posisi bar).
+    Bentuk garis tetap terjaga dengan hanya n_out titik yang dikirim ke browser.
+    """
+    y = np.asarray(y, dtype=float); n = len(y)
+    if n_out >= n or n_out < 3: return np.arange(n)
+    x = np.arange(n, dtype=float)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    idx = np.empty(n_out, dtype=np.int64); idx[0] = 0; idx[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 2 < len(edges): nx, ny = x[hi:edges[i + 2]].mean(), y[hi:edges[i + 2]].mean()
+        else: nx, ny = x[-1], y[-1]
+        area = np.abs((x[a] - nx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (ny - y[a]))
+        a = lo + int(np.argmax(area)); idx[i + 1] = a
+    return idx
+
+def minmax_downsample(y, n_out):
+    """Indeks min & max per bucket (urut waktu), agar lonjakan bar tidak hilang. y tidak boleh NaN."""
+    y = np.asarray(y, dtype=float); n = len(y)
+    if n <= n_out or n_out < 2: return np.arange(n)
+    width = -(-n // (n_out // 2))
+    blocks = np.full(width * -(-n // width), np.nan); blocks[:n] = y
+    blocks = blocks.reshape(-1, width)
+    base = np.arange(len(blocks)) * width
+    return np.unique(np.concatenate([base + np.nanargmin(blocks, axis=1), base + np.nanargmax(blocks, axis=1)]))
+
+CORR_COLORS = ['#FFFFFF', '#60A5FA', '#F472B6', '#FCD34D', '#34D399']
+
+def build_correlation_figure(gold, dxy, max_points=CHART_MAX_POINTS, corr=None):
+    """
+    Chart harga emas (LTTB) + tekanan DXY (min/max), sumbu waktu bersama.
+    corr (opsional): DataFrame seri korelasi rolling (kolom = nama garis), ditampilkan di panel ketiga (-1..1).
+    """
+    g = gold.iloc[lttb(gold.values, max_points)]
+    d = dxy.iloc[minmax_downsample(dxy.values, max_points)]
+    rows = 2 if corr is None or corr.empty else 3
+    fig = make_subplots(rows=rows, cols=1, shared_xaxes=True, vertical_spacing=0.05,
+                        row_heights=[0.65, 0.35] if rows == 2 else [0.5, 0.25, 0.25])
+    fig.add_trace(go.Scatter(x=g.index, y=g.values, mode='lines', name='Gold', line=dict(color='#FFD700', width=3), fill='tozeroy'), row=1, col=1)
+    fig.add_trace(go.Bar(x=d.index, y=d.values, name='DXY Pressure', marker_color=np.where(d.values > 0, '#FF4B4B', '#00CC96')), row=2, col=1)
+    if rows == 3:
+        # Seri rolling sudah halus: cukup dijarangkan merata
+        c = corr.iloc[np.unique(np.linspace(0, len(corr) - 1, min(len(corr), max_points)).astype(np.int64))]
+        for i, name in enumerate(c.columns):
+            fig.add_trace(go.Scatter(x=c.index, y=c[name].values, mode='lines', name=name,
+                                     line=dict(color=CORR_COLORS[i % len(CORR_COLORS)], width=1.5, dash='dot' if 'US10Y' in name else 'solid')), row=3, col=1)
+        fig.update_yaxes(range=[-1, 1], row=3, col=1)
+    fig.update_layout(template="plotly_dark", height=500 if rows == 2 else 620, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', margin=dict(l=0, r=0, t=30, b=0), showlegend=False)
+    return fig
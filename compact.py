@@ -0,0 +1,103 @@
+import time
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from barstore import to_epoch
+
+# ==========================================
+# STRUKTUR SNAPSHOT RINGKAS (READ-ONLY, DIBAGI ANTAR SESI TANPA SALINAN)
+# ==========================================
+# Snapshot dibaca semua sesi dari satu objek di memori proses (cache_resource), jadi isinya
+# tidak boleh diubah: array NumPy dibekukan (writeable=False), tabel memakai buffer Arrow
+# yang memang immutable dan langsung diterima st.dataframe tanpa konversi ke pandas.
+
+def _frozen(a, dtype):
+    """Array read-only. Array read-only dengan dtype yang sama dipakai apa adanya (view, tanpa salinan)."""
+    a = np.asarray(a)
+    if a.dtype == dtype and not a.flags.writeable: return a
+    a = np.array(a, dtype=dtype)
+    a.flags.writeable = False
+    return a
+
+class TimeSeries:
+    """
+    Seri waktu ringkas: ts = epoch detik dari index (int64), values float32. Pengganti pd.Series di snapshot:
+    tanpa index pandas/objek per elemen, pickle cukup dua buffer. tail() mengembalikan view, bukan salinan.
+    """
+    __slots__ = ('ts', 'values')
+
+    def __init__(self, ts, values):
+        object.__setattr__(self, 'ts', _frozen(ts, np.int64))
+        object.__setattr__(self, 'values', _frozen(values, np.float32))
+
+    @classmethod
+    def from_series(cls, s):
+        """pd.Series berindex datetime (naive) -> TimeSeries; NaN dibuang sekali di sini."""
+        s = s.dropna()
+        return cls(to_epoch(s.index), s.to_numpy())
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} read-only")
+
+    def __reduce__(self):
+        return (_restore, (TimeSeries, self.ts, self.values))
+
+    def __len__(self):
+        return len(self.ts)
+
+    def tail(self, n):
+        return TimeSeries(self.ts[-n:], self.values[-n:])
+
+    def label(self, i, fmt='%Y-%m-%d %H:%M'):
+        return time.strftime(fmt, time.gmtime(int(self.ts[i])))
+
+    def to_series(self):
+        """pd.Series (salinan) untuk pustaka yang butuh pandas, mis. membangun figure plotly sekali per versi."""
+        return pd.Series(self.values.astype(float), index=pd.to_datetime(self.ts, unit='s'))
+
+def _restore(cls, *values):
+    """Unpickle: array hasil load milik objek ini sendiri, cukup dibekukan di tempat (tanpa salinan)."""
+    obj = object.__new__(cls)
+    for name, v in zip(cls.__slots__, values):
+        if isinstance(v, np.ndarray): v.flags.writeable = False
+        object.__setattr__(obj, name, v)
+    return obj
+
+class Panel:
+    """Beberapa seri dengan sumbu waktu sama: ts (n,) int64, values (k, n) float32, names (k,). row() = view TimeSeries."""
+    __slots__ = ('ts', 'values', 'names')
+
+    def __init__(self, ts, values, names):
+        object.__setattr__(self, 'ts', _frozen(ts, np.int64))
+        object.__setattr__(self, 'values', _frozen(np.atleast_2d(values), np.float32))
+        object.__setattr__(self, 'names', tuple(names))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} read-only")
+
+    def __reduce__(self):
+        return (_restore, (Panel, self.ts, self.values, self.names))
+
+    def __len__(self):
+        return len(self.ts)
+
+    def row(self, name):
+        return TimeSeries(self.ts, self.values[self.names.index(name)])
+
+    def tail(self, n):
+        return Panel(self.ts[-n:], self.values[:, -n:], self.names)
+
+    def to_frame(self):
+        """pd.DataFrame (salinan) untuk membangun figure sekali per versi."""
+        return pd.DataFrame(self.values.T.astype(float), index=pd.to_datetime(self.ts, unit='s'), columns=list(self.names))
+
+def to_table(df, index=None):
+    """DataFrame -> pa.Table immutable. `index`: nama kolom untuk index (None = index dibuang)."""
+    if index is not None: df = df.rename_axis(index).reset_index()
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+def scalars(obj):
+    """Skalar NumPy/pandas -> float Python (rekursif dalam dict/Series) agar snapshot tidak menyimpan objek pandas."""
+    if isinstance(obj, (dict, pd.Series)): return {k: scalars(v) for k, v in obj.items()}
+    if isinstance(obj, np.generic): return obj.item()
+    return obj
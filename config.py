@@ -0,0 +1,51 @@
+import os
+from datetime import datetime
+
+# ==========================================
+# KONFIGURASI BERSAMA (DASHBOARD, BACKTEST, BENCHMARK)
+# ==========================================
+# Sengaja hanya stdlib: diimport auth.py di jalur login, juga oleh backtest.py & bench/run.py
+# yang berjalan tanpa Streamlit.
+
+# --- DIREKTORI DATA RUNTIME (TOKEN DICABUT, BAR, SNAPSHOT, KALENDER, METRIK) ---
+DATA_DIR = os.environ.get("MAFAFX_DATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".mafafx"))
+BARSTORE_PATH = os.path.join(DATA_DIR, "bars.sqlite")
+
+# --- ZONA WAKTU TAMPILAN (WIB = UTC+7); SEMUA TIMESTAMP DISIMPAN SEBAGAI EPOCH UTC ---
+WIB_OFFSET = 7 * 3600
+
+# --- WATCHLIST (DASHBOARD BISA MENGGANTI VIA st.secrets["watchlist"]["symbols"]) ---
+GOLD_SYMBOL = "XAU/USD"
+USD_PROXY = "EUR/USD"   # dibalik tandanya sebagai proxy DXY
+WATCHLIST = ["XAU/USD", "EUR/USD", "XAG/USD", "GBP/USD", "USD/JPY"]
+
+# --- RIWAYAT BAR ---
+BAR_LOOKBACK = 500     # jumlah bar yang dibaca untuk indikator
+CHART_RANGES = [50, 200, 500]   # pilihan rentang chart (bar pada timeframe aktif)
+
+# --- MULTI-TIMEFRAME: (interval bar tersimpan, aturan resample lokal) ---
+# M15 & H1 disinkronkan dari upstream; H4/D1/W1 dibangun lokal dari H1 tanpa request tambahan.
+TIMEFRAMES = {
+    'M15': ('15min', None),
+    'H1': ('1h', None),
+    'H4': ('1h', '4h'),
+    'D1': ('1h', '24h'),
+    'W1': ('1h', '168h'),
+}
+TF_ORIGIN = datetime(2024, 1, 7, 22)   # Minggu 22:00 UTC: pembukaan pekan FX, batas candle D1/W1
+MTF_LOOKBACK = 6000   # bar H1 yang dibaca untuk resample (~1 tahun jam trading)
+
+# --- ENGINE INDIKATOR ---
+INDICATOR_CONFIG = {'rsi': (14,), 'ema': (20, 50), 'atr': (14,), 'macd': (12, 26, 9)}
+
+# --- KORELASI ROLLING EMAS VS PROXY DXY & US10Y (WINDOW DALAM BAR TIMEFRAME AKTIF) ---
+# Per timeframe agar semua window bisa warm-up dari MTF_LOOKBACK (~1 tahun H1: ~250 bar D1, ~50 bar W1)
+CORR_WINDOWS = {
+    'M15': (20, 60, 240),
+    'H1': (20, 60, 240),
+    'H4': (20, 60, 240),
+    'D1': (20, 60, 120),
+    'W1': (4, 13, 26),
+}
+# z-score residual emas vs DXY pada window ini ikut menentukan bias emas
+CORR_BIAS_WINDOW = {'M15': 60, 'H1': 60, 'H4': 60, 'D1': 60, 'W1': 13}
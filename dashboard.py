@@ -0,0 +1,891 @@
+import functools
+import json
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+import numpy as np
+import pandas as pd
+import pyarrow.compute as pc
+import streamlit as st
+from pandas.tseries.frequencies import to_offset
+from auth import logout
+from barstore import BarStore, format_ts, to_epoch
+from indicators import IndicatorEngine, RollingStats
+from engine import get_twelvedata, get_us10y_data, process_data, resample_bars, aligned_returns, last_bar, yield_change
+from calendarstore import CalendarStore, wib_day
+from charts import build_correlation_figure, CHART_MAX_POINTS
+from config import (BAR_LOOKBACK, BARSTORE_PATH, CHART_RANGES, CORR_BIAS_WINDOW, CORR_WINDOWS, DATA_DIR, GOLD_SYMBOL,
+                    INDICATOR_CONFIG, MTF_LOOKBACK, TF_ORIGIN, TIMEFRAMES, USD_PROXY, WATCHLIST, WIB_OFFSET)
+from compact import Panel, TimeSeries, scalars, to_table
+from levels import LEVEL_WINDOW, SESSIONS, SessionLevels, active_sessions, key_levels, last_closed
+import alerts
+import livefeed
+from metrics import METRICS, record_error, span
+from signals import BIAS_PARAMS, SIGNAL_PARAMS, determine_bias, h1_signal, timeframe_params, usd_sign
+
+try: import fcntl
+except ImportError: fcntl = None
+
+# Modul dashboard: hanya diimport app.py setelah login berhasil (pandas, plotly, yfinance, dst.
+# tidak dimuat di halaman login).
+
+# --- BATAS WAKTU FETCH (DETIK) ---
+SOURCE_TIMEOUT = {'BARS': 8, 'M15': 8, 'US10Y': 8, 'NEWS': 8}
+FETCH_DEADLINE = 12
+
+# --- SNAPSHOT BERSAMA (SATU FETCH UNTUK SEMUA SESI & PROSES) ---
+SNAPSHOT_INTERVAL = 300
+SNAPSHOT_POLL_TICK = 15
+SNAPSHOT_PATH = os.path.join(DATA_DIR, "snapshot.pkl")
+SNAPSHOT_SCHEMA = 9   # naikkan bila struktur snapshot berubah; file lama diabaikan
+
+# --- KALENDER EKONOMI (FILE BERSAMA, REVALIDASI CONDITIONAL GET) ---
+CALENDAR_PATH = os.path.join(DATA_DIR, "calendar.json")
+CALENDAR_REVALIDATE = 900
+CALENDAR_CURRENCIES = ["USD"]
+CALENDAR_IMPACTS = ("High", "Medium")
+
+# --- REFRESH MANUAL: UMUR DATA MINIMUM PER SUMBER (DETIK) & BATAS TUNGGU UI ---
+# Harus di bawah jadwal otomatisnya (SNAPSHOT_INTERVAL, CALENDAR_REVALIDATE), kalau tidak sumber tak pernah due
+REFRESH_MIN_INTERVAL = {'BARS': 60, 'M15': 60, 'US10Y': 120, 'NEWS': 600}
+REFRESH_BACKOFF_MAX = 1800   # batas jeda setelah gagal beruntun (interval minimum x 2^gagal)
+REFRESH_WAIT = 3
+ATTEMPTS_PATH = os.path.join(DATA_DIR, "attempts.json")   # percobaan fetch terakhir per sumber, dibagi antar proses
+CACHED_SOURCES = ('NEWS',)   # mencatat percobaannya sendiri, hanya saat upstream benar-benar dihubungi (fetch_news)
+
+# --- ALERT SINYAL (SATU EVALUASI PER BAR H1 CLOSE, DIKIRIM DARI POLLER, BUKAN DARI SESI) ---
+ALERTS_PATH = os.path.join(DATA_DIR, "alerts.json")
+
+# --- METRIK (TEKS PROMETHEUS, SATU FILE PER PROSES; DIPERBARUI TIAP TICK POLLER) ---
+METRICS_PATH = os.path.join(DATA_DIR, "metrics", f"{os.getpid()}.prom")
+
+# --- BAR STORE (RIWAYAT OHLC LOKAL; PATH, LOOKBACK, TIMEFRAME, WATCHLIST & WINDOW DI config.py) ---
+BARSTORE_SEED = 5000   # outputsize maksimum Twelve Data, hanya untuk pengisian awal
+BARSTORE_SEED_RETRY = 3600   # detik sebelum simbol yang gagal/kosong saat pengisian awal dicoba lagi
+
+# --- MULTI-TIMEFRAME ---
+TF_LABELS = {'M15': "15 Menit", 'H1': "1 Jam", 'H4': "4 Jam", 'D1': "1 Hari", 'W1': "1 Minggu"}
+TF_STEP = {tf: pd.Timedelta(rule or interval) for tf, (interval, rule) in TIMEFRAMES.items()}
+# Threshold bias & sinyal (disetel untuk H1) per timeframe, lihat signals.timeframe_params
+TF_PARAMS = {tf: {name: timeframe_params(params, step / pd.Timedelta(hours=1))
+                  for name, params in (('bias', BIAS_PARAMS), ('signal', SIGNAL_PARAMS))} for tf, step in TF_STEP.items()}
+
+# --- LIVE MODE (STREAMING) ---
+LIVE_PUSH_EVERY = 3   # detik, interval push widget harga/sinyal ke sesi
+
+# --- FORMAT TABEL WATCHLIST (TABEL ARROW DI SNAPSHOT, FORMAT DIBERIKAN SAAT RENDER) ---
+WATCHLIST_FORMAT = {
+    'Harga': st.column_config.NumberColumn(format="%.4f"), 'Chg %': st.column_config.NumberColumn(format="%+.2f"),
+    'RSI': st.column_config.NumberColumn(format="%.1f"), 'R1': st.column_config.NumberColumn(format="%.4f"),
+    'S1': st.column_config.NumberColumn(format="%.4f"), 'Pivot': st.column_config.NumberColumn(format="%.4f"),
+}
+
+# --- KEY LEVEL (SEMUA METODE DIHITUNG DI SNAPSHOT, PILIHAN METODE HANYA LOOKUP) ---
+LEVEL_METHODS = {'range': "Range", 'classic': "Classic", 'fibonacci': "Fibonacci", 'camarilla': "Camarilla",
+                 'atr': "ATR", 'session': "Sesi"}
+# Pivot dari periode lebih tinggi terakhir yang sudah close: aturan resample dari H1 & periode acuan per timeframe
+PIVOT_RULES = {'D1': '24h', 'W1': '168h', 'MN': 'MS'}
+PIVOT_LABELS = {'D1': "harian", 'W1': "mingguan", 'MN': "bulanan"}
+TF_PIVOT = {'M15': 'D1', 'H1': 'D1', 'H4': 'D1', 'D1': 'W1', 'W1': 'MN'}
+SESSION_LABELS = {'ASIA': "🌏 Asia", 'LONDON': "🇪🇺 London", 'NEW_YORK': "🇺🇸 New York"}
+
+# ==========================================
+# 3. ENGINE DATA & SESI PASAR
+# ==========================================
+
+def get_current_session_info():
+    """
+    Menentukan sesi pasar berdasarkan Jam WIB (UTC+7).
+    """
+    wib_hour = time.gmtime(time.time() + WIB_OFFSET).tm_hour
+    active = active_sessions(wib_hour)   # jendela sesi sama dengan high/low sesi (levels.SESSIONS)
+    
+    if len(active) > 1:
+        return "🔥 OVERLAP (NY+LDN)", "#F87171" 
+    elif active == ['ASIA']:
+        return "🌏 SESI ASIA", "#FCD34D" 
+    elif active == ['LONDON']:
+        return "🇪🇺 SESI LONDON", "#60A5FA" 
+    elif active == ['NEW_YORK']:
+        return "🇺🇸 SESI NEW YORK", "#34D399" 
+    else:
+        return "💤 PRE-MARKET", "#9CA3AF" 
+
+def get_watchlist():
+    try: symbols = list(st.secrets["watchlist"]["symbols"])
+    except: symbols = WATCHLIST
+    return list(dict.fromkeys([GOLD_SYMBOL, USD_PROXY, *symbols]))
+
+@st.cache_resource
+def get_bar_store():
+    return BarStore(BARSTORE_PATH)
+
+@st.cache_resource
+def get_seed_attempts():
+    return {}   # (symbol, interval) -> waktu pengisian awal terakhir yang gagal/kosong
+
+def sync_bars(symbols, interval, api_key, lookback=BAR_LOOKBACK, timeout=10):
+    """
+    Sinkronisasi inkremental ke bar store dengan request batch: simbol baru diisi sekali dengan
+    riwayat maksimum, simbol lain hanya minta bar sejak timestamp terakhir yang tersimpan,
+    lalu backfill maksimal satu celah per siklus. Return: frame kolumnar `lookback` bar terbaru dari store,
+    None bila request upstream gagal (fetch_sources lalu memakai riwayat tersimpan sebagai data stale).
+    Simbol baru yang gagal/kosong (termasuk bila seluruh batch gagal) baru diminta lagi setelah
+    BARSTORE_SEED_RETRY; celah hanya ditandai sudah dicoba bila request backfill-nya berhasil.
+    """
+    store = get_bar_store(); attempts = get_seed_attempts()
+    last = {s: store.last_ts(s, interval) for s in symbols}
+    known = [s for s in symbols if last[s] is not None]
+    new = [s for s in symbols if last[s] is None and time.time() - attempts.get((s, interval), 0) >= BARSTORE_SEED_RETRY]
+    if new:
+        got = get_twelvedata(new, interval, api_key, timeout, outputsize=BARSTORE_SEED)
+        for s in new:
+            vals = (got or {}).get(s)
+            if not vals: attempts[(s, interval)] = time.time(); continue
+            attempts.pop((s, interval), None)
+            with span("store.upsert"): store.upsert(s, interval, vals)
+            store.mark_checked(s, interval, store.gaps(s, interval))  # celah bawaan upstream
+        if got is None and not known: return None
+    elif not known: return None   # semua simbol masih menunggu BARSTORE_SEED_RETRY, tanpa request
+    if known:
+        since = format_ts(min(last[s] for s in known))
+        got = get_twelvedata(known, interval, api_key, timeout, outputsize=BARSTORE_SEED, start_date=since)
+        if got is None: return None
+        with span("store.upsert"):
+            for s, vals in got.items(): store.upsert(s, interval, vals)
+        gaps = [(s, g) for s in known for g in store.gaps(s, interval)]
+        for s, (start, stop) in gaps[:1]:
+            got = get_twelvedata([s], interval, api_key, timeout, outputsize=BARSTORE_SEED,
+                                 start_date=format_ts(start), end_date=format_ts(stop))
+            if got is None or got.get(s) is None: continue  # gagal: coba lagi siklus berikutnya
+            store.upsert(s, interval, got[s])
+            store.mark_checked(s, interval, [(start, stop)])
+    with span("store.load_frame"): return store.load_frame(symbols, interval, limit=lookback)
+
+def stored_bars(symbols, interval, lookback=BAR_LOOKBACK):
+    """Riwayat di bar store tanpa request upstream (cadangan saat sync gagal); None bila store belum berisi simbol ini."""
+    store = get_bar_store()
+    if all(store.last_ts(s, interval) is None for s in symbols): return None
+    with span("store.load_frame"): return store.load_frame(symbols, interval, limit=lookback)
+
+@st.cache_resource
+def get_indicator_engines():
+    return {}
+
+def calculate_indicators(key, bars):
+    """
+    Nilai indikator untuk bar terbaru. Bar yang sudah close di-commit ke state engine per key
+    (timeframe, simbol) (O(1) per bar baru); bar terakhir yang masih berjalan hanya dihitung tanpa commit.
+    """
+    engines = get_indicator_engines()
+    closed = bars.iloc[:-1]; last = bars.iloc[-1]
+    engine, last_ts = engines.get(key, (None, None))
+    if engine is None or last_ts not in closed.index:
+        engine = IndicatorEngine(**INDICATOR_CONFIG)
+        engine.compute(closed['high'].values, closed['low'].values, closed['close'].values)
+    else:
+        for bar in closed.loc[closed.index > last_ts].itertuples():
+            engine.update(bar.high, bar.low, bar.close)
+    engines[key] = (engine, closed.index[-1])
+    return engine.update(last['high'], last['low'], last['close'], commit=False)
+
+def closed_bar_inputs(tf, bars, yields):
+    """
+    Input sinyal & bias pada bar emas terakhir yang sudah close (untuk alert): RSI dari state engine indikator
+    yang sudah di-commit (calculate_indicators), perubahan proxy DXY pada bar itu, dan perubahan yield dari
+    awal ke akhir bar itu (sama dengan backtest; tanpa seri yield = netral). None bila DXY tidak punya bar itu.
+    """
+    gold = bars.xs(GOLD_SYMBOL, axis=1, level=1).dropna()
+    if len(gold) < 2: return None
+    start = gold.index[-2]
+    dxy = bars['close'][USD_PROXY].loc[:start].dropna()
+    if len(dxy) < 2 or dxy.index[-1] != start: return None
+    engine, _ = get_indicator_engines()[(tf, GOLD_SYMBOL)]
+    us10y_chg = yield_change(yields, start, start + TF_STEP[tf])
+    return scalars({'ts': int(to_epoch(gold.index[-2:-1])[0]), 'price': gold['close'].iloc[-2],
+                    'dxy_c': -(dxy.iloc[-1] - dxy.iloc[-2]) / dxy.iloc[-2] * 100,
+                    'rsi': engine.values()['rsi'][14], 'us10y_chg': 0.0 if us10y_chg != us10y_chg else us10y_chg})
+
+@st.cache_resource
+def get_correlation_engines():
+    return {}
+
+def calculate_correlations(key, ts, x, y, keep, windows):
+    """
+    Seri korelasi/beta/z rolling (k, n) `keep` bar terakhir untuk y ~ x. Pola sama dengan calculate_indicators:
+    bar close di-commit ke RollingStats per key (O(k) per bar baru) dan seri hasilnya disimpan;
+    bar terakhir yang masih berjalan hanya dihitung tanpa commit.
+    """
+    engines = get_correlation_engines()
+    engine, last_ts, hist = engines.get(key, (None, None, None))
+    closed = len(ts) - 1
+    pos = int(np.searchsorted(ts[:closed], last_ts)) if engine is not None else closed
+    if engine is None or pos >= closed or ts[pos] != last_ts:
+        engine = RollingStats(windows)
+        hist = {k: v[:, -keep:] for k, v in engine.compute(x[:closed], y[:closed]).items()}
+    else:
+        rows = [engine.update(x[i], y[i]) for i in range(pos + 1, closed)]
+        if rows: hist = {k: np.concatenate([v, np.stack([r[k] for r in rows], axis=1)], axis=1)[:, -keep:] for k, v in hist.items()}
+    engines[key] = (engine, ts[closed - 1], hist)
+    last = engine.update(x[-1], y[-1], commit=False)
+    return {k: np.concatenate([v, last[k][:, None]], axis=1)[:, -keep:] for k, v in hist.items()}
+
+def tracked_cache_data(**kwargs):
+    """st.cache_data + hit/miss/umur entri di METRICS: body fungsi hanya jalan saat miss."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def compute(*args, **kw):
+            METRICS.cache_miss(fn.__name__, ", ".join([*map(repr, args), *(f"{k}={v!r}" for k, v in kw.items())]))
+            return fn(*args, **kw)
+        cached = st.cache_data(**kwargs)(compute)
+        @functools.wraps(fn)
+        def call(*args, **kw):
+            METRICS.cache_call(fn.__name__)
+            return cached(*args, **kw)
+        call.clear = cached.clear
+        return call
+    return decorate
+
+def get_calendar_currencies():
+    try: return list(st.secrets["calendar"]["currencies"])
+    except: return CALENDAR_CURRENCIES
+
+@st.cache_resource
+def get_calendar_store():
+    return CalendarStore(CALENDAR_PATH)
+
+@tracked_cache_data(ttl=CALENDAR_REVALIDATE, show_spinner=False)
+def fetch_news(timeout=10):
+    """Event hari ini & minggu ini dari kalender tersimpan; upstream hanya dicek (conditional GET) bila sudah due."""
+    store = get_calendar_store()
+    try:
+        if store.sync(timeout, min_interval=CALENDAR_REVALIDATE) is not None: record_attempts({'NEWS': True})
+    except Exception as e: record_error("NEWS", e); record_attempts({'NEWS': False})
+    if not len(store): return None
+    currencies = get_calendar_currencies()
+    return store.day(wib_day(time.time()), currencies, CALENDAR_IMPACTS), store.week(currencies, CALENDAR_IMPACTS)
+
+@st.cache_resource
+def get_fetch_pool():
+    return ThreadPoolExecutor(max_workers=len(SOURCE_TIMEOUT), thread_name_prefix="mafafx-fetch")
+
+@st.cache_resource
+def get_last_good():
+    return {}
+
+class SourceAttempts:
+    """
+    Per sumber: percobaan upstream terakhir ('at'), fetch sukses terakhir ('ok') & jumlah gagal beruntun,
+    disimpan di file bersama agar berlaku untuk percobaan dari proses mana pun. Hanya dicatat saat upstream
+    benar-benar dihubungi (cache hit bukan percobaan).
+    """
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def load(self):
+        try:
+            with open(self.path) as f: return json.load(f)
+        except (OSError, ValueError): return {}
+
+    def record(self, outcomes):
+        """outcomes: {sumber: True bila sukses}."""
+        with self._lock:
+            state = self.load(); now = time.time()
+            for name, ok in outcomes.items():
+                prev = state.get(name, {})
+                state[name] = {'at': now, 'ok': now if ok else prev.get('ok', 0.0),
+                               'failures': 0 if ok else prev.get('failures', 0) + 1}
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f: json.dump(state, f)
+            os.replace(tmp, self.path)
+
+    def due(self, min_interval, backoff_max=REFRESH_BACKOFF_MAX, now=None):
+        """
+        Sumber yang datanya (fetch sukses terakhir) lebih tua dari interval minimum. Setelah gagal beruntun,
+        percobaan berikutnya menunggu interval x 2^gagal (maks. backoff_max) sejak percobaan terakhir.
+        """
+        state = self.load(); now = time.time() if now is None else now
+        due = []
+        for name, gap in min_interval.items():
+            a = state.get(name)
+            if a is None: due.append(name); continue
+            if now - a.get('ok', 0.0) < gap: continue
+            if a['failures'] and now - a['at'] < min(gap * 2 ** a['failures'], max(gap, backoff_max)): continue
+            due.append(name)
+        return due
+
+@st.cache_resource
+def get_source_attempts():
+    return SourceAttempts(ATTEMPTS_PATH)
+
+def record_attempts(outcomes):
+    try: get_source_attempts().record(outcomes)
+    except OSError as e: record_error("ATTEMPTS", e)
+
+def timed_source(name, fn, *args, **kwargs):
+    with span(f"fetch.{name}"): return fn(*args, **kwargs)
+
+def fetch_sources(jobs, deadline=FETCH_DEADLINE, only=None, fallback=None):
+    """
+    Menjalankan semua sumber secara paralel dengan batas waktu per sumber dan total.
+    Sumber yang gagal/timeout memakai nilai terakhir yang valid (stale) jika ada; tanpa nilai terakhir
+    (mis. setelah restart), `fallback[sumber]()` dipakai bila ada, juga berstatus stale.
+    Bila `only` diisi, sumber lain yang punya nilai terakhir dipakai ulang tanpa fetch.
+    Return: (hasil per sumber, status per sumber: 'ok' / 'stale' / 'failed').
+    """
+    pool = get_fetch_pool(); last_good = get_last_good()
+    results, status = {}, {}
+    if only is not None:
+        reuse = [name for name in jobs if name not in only and name in last_good]
+        for name in reuse:
+            results[name], ts = last_good[name]; status[name] = {'state': 'ok', 'age': time.time() - ts}
+        jobs = {name: job for name, job in jobs.items() if name not in reuse}
+    start = time.monotonic(); outcomes = {}
+    futures = {name: pool.submit(timed_source, name, fn, *args, timeout=SOURCE_TIMEOUT[name]) for name, (fn, args) in jobs.items()}
+    for name, fut in futures.items():
+        wait_for = min(SOURCE_TIMEOUT[name], deadline) - (time.monotonic() - start)
+        try: val = fut.result(timeout=max(wait_for, 0))
+        except FutureTimeout: val = None; fut.cancel(); record_error(name, kind="deadline")
+        except Exception as e: val = None; record_error(name, e)
+        outcomes[name] = val is not None and len(val) > 0
+        if outcomes[name]:
+            last_good[name] = (val, time.time())
+            results[name] = val; status[name] = {'state': 'ok', 'age': 0}
+        elif name in last_good:
+            val, ts = last_good[name]
+            results[name] = val; status[name] = {'state': 'stale', 'age': time.time() - ts}
+        else:
+            val = (fallback or {}).get(name, lambda: None)()
+            results[name] = val; status[name] = {'state': 'failed' if val is None else 'stale', 'age': None}
+    record_attempts({k: v for k, v in outcomes.items() if k not in CACHED_SOURCES})
+    return results, status
+
+def analyze_correlations(tf, bars, yields):
+    """
+    Korelasi, beta & z-score residual rolling return emas vs proxy DXY dan vs US10Y (CORR_WINDOWS[tf]).
+    Window yang lebih panjang dari riwayat sumbernya tidak ditampilkan (tidak pernah warm-up).
+    Return {'chart': Panel seri untuk overlay chart (waktu WIB), 'latest': nilai bar terakhir per window tampil,
+    'bias_window': window z bias, 'bias_z': nama baris z bias (None bila window itu belum tersedia)}.
+    """
+    ts, gold, dxy, us10y = aligned_returns(bars, GOLD_SYMBOL, USD_PROXY, yields, TF_STEP[tf])
+    if len(ts) < 2: return None
+    keep = max(CHART_RANGES); windows = CORR_WINDOWS[tf]; bias_w = CORR_BIAS_WINDOW[tf]
+    stats = {'DXY': (ts, calculate_correlations((tf, 'DXY'), ts, dxy, gold, keep, windows))}
+    has = ~np.isnan(us10y)
+    if has.sum() >= min(windows):
+        stats['US10Y'] = (ts[has], calculate_correlations((tf, 'US10Y'), ts[has], us10y[has], gold[has], keep, windows))
+    chart_ts = ts[-keep:]; n = len(chart_ts)
+    names, rows, latest = [], [], {}
+    # Overlay chart: korelasi DXY semua window, korelasi US10Y & z DXY (input bias) pada window bias
+    plotted = {('corr', 'DXY'): windows, ('corr', 'US10Y'): (bias_w,), ('z', 'DXY'): (bias_w,)}
+    for src, (src_ts, res) in stats.items():
+        shown = [(i, w) for i, w in enumerate(windows) if w <= len(src_ts)]
+        src_ts = src_ts[-res['corr'].shape[1]:]
+        pos = np.minimum(np.searchsorted(chart_ts, src_ts), n - 1); ok = chart_ts[pos] == src_ts
+        for kind, label in (('corr', "Korelasi"), ('z', "Z")):
+            for i, w in shown:
+                if w not in plotted.get((kind, src), ()): continue
+                row = np.full(n, np.nan); row[pos[ok]] = res[kind][i][ok]
+                names.append(f"{label} {src} {w}"); rows.append(row)
+        latest[src] = {kind: {w: float(res[kind][i, -1]) for i, w in shown} for kind in ('corr', 'beta', 'z')}
+    bias_z = f"Z DXY {bias_w}"
+    return {'chart': Panel(chart_ts + WIB_OFFSET, np.vstack(rows), names), 'latest': latest,
+            'bias_window': bias_w, 'bias_z': bias_z if bias_z in names else None}
+
+def analyze_timeframe(tf, bars, watchlist, us10y, yields=None, pivot=None):
+    """
+    Harga, indikator, key level, korelasi, bias & tabel watchlist satu timeframe untuk semua simbol sekaligus.
+    us10y: {'price', 'chg'} H1; perubahan yield timeframe ini diambil dari `yields` pada bar yang sama dengan harga.
+    pivot: (frame, end) periode acuan pivot (TF_PIVOT, lihat pivot_source); None = level pivot NaN.
+    """
+    with span("process_data"): px = process_data(bars, inverse=(USD_PROXY,), keep=max(CHART_RANGES))
+    if px is None or not {GOLD_SYMBOL, USD_PROXY} <= set(px['p'].dropna().index): return None
+    
+    symbols = [s for s in watchlist if s in px['p'].dropna().index]
+    with span("indicators"): ind = {s: calculate_indicators((tf, s), bars.xs(s, axis=1, level=1).dropna()) for s in symbols}
+    # 'range' dari bar timeframe ini; pivot dari H/L/C periode acuan terakhir yang sudah close (bar berjalan diabaikan).
+    # Band ATR memakai ATR dari engine indikator
+    hlc = lambda frame: [frame[f].reindex(columns=symbols).to_numpy() for f in ('high', 'low', 'close')]
+    with span("sr_levels"):
+        prev = last_closed(*hlc(pivot[0]), pivot[1]) if pivot else [np.full(len(symbols), np.nan)] * 3
+        levels = key_levels(*hlc(bars), prev, atr=[ind[s]['atr'][14] for s in symbols])
+    gi = symbols.index(GOLD_SYMBOL)
+    rsi = pd.Series({s: ind[s]['rsi'][14] for s in symbols})
+    sentiment = scalars({'net_score': (rsi[GOLD_SYMBOL]-50)/50, 'bullish': rsi[GOLD_SYMBOL], 'bearish': 100-rsi[GOLD_SYMBOL]})
+    dc = px['c'][USD_PROXY]
+    us10y_chg = yield_change(yields, bars.index[-1])
+    if us10y_chg != us10y_chg: us10y_chg = us10y['chg'] if tf == 'H1' else 0.0  # tanpa seri yield: netral di luar H1
+    with span("correlation"): corr = analyze_correlations(tf, bars, yields)
+    # z-score residual vs DXY hanya dihitung untuk emas; simbol lain tanpa input ini (NaN)
+    z = corr['latest']['DXY']['z'].get(corr['bias_window'], np.nan) if corr else np.nan
+    with span("bias"): biases = dict(zip(symbols, determine_bias(dc, us10y_chg, rsi.values, [usd_sign(s) for s in symbols],
+                                                                 TF_PARAMS[tf]['bias'],
+                                                                 z=[z if s == GOLD_SYMBOL else np.nan for s in symbols])))
+    chg = px['c'][symbols].copy(); chg[USD_PROXY] *= -1  # tabel memakai perubahan asli, bukan proxy DXY
+    watch = pd.DataFrame({
+        'Harga': px['p'][symbols], 'Chg %': chg, 'RSI': rsi,
+        'Bias': [biases[s][0] for s in symbols],
+        'R1': levels['range']['R1'], 'S1': levels['range']['S1'], 'Pivot': levels['range']['P'],
+    }, index=symbols)
+    bias_text, bias_col = biases[GOLD_SYMBOL]
+    
+    # Bentuk ringkas & read-only (compact.py): skalar Python, seri float32, tabel Arrow; tanpa objek pandas
+    return {
+        'TIMEFRAME': tf,
+        'GOLD': {**scalars({'p': px['p'][GOLD_SYMBOL], 'c': px['c'][GOLD_SYMBOL],
+                            'levels': {m: {k: v[gi] for k, v in lv.items()} for m, lv in levels.items()},
+                            'ind': ind[GOLD_SYMBOL], 'bar': last_bar(bars, GOLD_SYMBOL)}),
+                 'chart': TimeSeries.from_series(px['chart'][GOLD_SYMBOL])},
+        'DXY': {**scalars({'p': px['p'][USD_PROXY], 'c': dc, 'bar': last_bar(bars, USD_PROXY)}),
+                'chart': TimeSeries.from_series(px['ret'][USD_PROXY])},
+        'US10Y': {'price': us10y['price'], 'chg': us10y_chg},
+        'CLOSED': closed_bar_inputs(tf, bars, yields),
+        'SENTIMENT': sentiment,
+        'CORR': corr,
+        'BIAS': {'text': bias_text, 'color': bias_col},
+        'WATCHLIST': to_table(watch, index='Simbol'),
+    }
+
+@st.cache_resource
+def get_session_levels():
+    return SessionLevels()
+
+def analyze_sessions(bars, watchlist):
+    """High/low sesi Asia/London/New York terakhir yang sudah close dari bar H1 (cache per sesi, lihat SessionLevels)."""
+    symbols = [s for s in watchlist if s in bars['high'].columns]
+    ts = to_epoch(bars.index)
+    return get_session_levels().update(ts, bars['high'][symbols].to_numpy(), bars['low'][symbols].to_numpy(), symbols)
+
+def pivot_source(bars, rule):
+    """(frame, end) periode acuan pivot: frame hasil resample & epoch UTC akhir tiap periode (untuk last_closed)."""
+    if bars is None: return None
+    return bars, to_epoch(bars.index + to_offset(rule))
+
+def build_market_snapshot(sources=None):
+    """Snapshot pasar lengkap. `sources`: hanya sumber ini yang divalidasi ulang ke upstream (None = semua)."""
+    try: api = st.secrets["twelvedata"]["api_key"]
+    except: return None
+    watchlist = get_watchlist()
+    if sources is not None and 'NEWS' in sources:
+        get_calendar_store().expire(); fetch_news.clear()  # revalidasi kalender saja, cache lain utuh
+    raw, status = fetch_sources({
+        'BARS': (sync_bars, (watchlist, "1h", api, MTF_LOOKBACK)),
+        'M15': (sync_bars, (watchlist, "15min", api)),
+        'US10Y': (get_us10y_data, ()),
+        'NEWS': (fetch_news, ()),
+    }, only=sources, fallback={
+        'BARS': functools.partial(stored_bars, watchlist, "1h", MTF_LOOKBACK),
+        'M15': functools.partial(stored_bars, watchlist, "15min"),
+    })
+    us10y = scalars({k: v for k, v in (raw['US10Y'] or {'price': 0, 'chg': 0}).items() if k != 'series'})
+    yields = (raw['US10Y'] or {}).get('series')  # perubahan yield per timeframe & korelasi, tidak masuk snapshot
+    news_today, news_week = raw['NEWS'] or (pd.DataFrame(), pd.DataFrame())
+
+    # H4/D1/W1 & periode pivot dari H1, sekali per aturan (D1/W1 dipakai bersama untuk view & pivot)
+    rules = {rule for _, rule in TIMEFRAMES.values() if rule} | set(PIVOT_RULES.values())
+    with span("resample"): higher = {rule: resample_bars(raw['BARS'], rule, origin=TF_ORIGIN) for rule in rules}
+    pivots = {name: pivot_source(higher[rule], rule) for name, rule in PIVOT_RULES.items()}
+
+    views = {}
+    for tf, (interval, rule) in TIMEFRAMES.items():
+        bars = raw['M15'] if interval == '15min' else higher[rule] if rule else raw['BARS']
+        if bars is None: continue
+        view = analyze_timeframe(tf, bars, watchlist, us10y, yields, pivots[TF_PIVOT[tf]])
+        if view is not None: views[tf] = view
+    if 'H1' not in views: return None
+    with span("session_levels"): sessions = analyze_sessions(raw['BARS'], watchlist)
+    
+    return {
+        'TF': views, 'US10Y': us10y, 'SESSIONS': sessions,
+        'NEWS': {'today': to_table(news_today), 'week': to_table(news_week)},
+        'STATUS': status, 'UPDATED': time.time(), 'SCHEMA': SNAPSHOT_SCHEMA
+    }
+
+@st.cache_resource
+def get_signal_alerts():
+    """
+    Notifier dari st.secrets["alerts"]: telegram_token + telegram_chat_id, webhook_url,
+    dan/atau local_path (pengganti lokal untuk testing, alert ditulis sebagai baris JSON).
+    """
+    try: cfg = dict(st.secrets["alerts"])
+    except: cfg = {}
+    notifiers = []
+    if cfg.get("telegram_token") and cfg.get("telegram_chat_id"):
+        notifiers.append(alerts.TelegramNotifier(cfg["telegram_token"], cfg["telegram_chat_id"]))
+    if cfg.get("webhook_url"): notifiers.append(alerts.WebhookNotifier(cfg["webhook_url"]))
+    if cfg.get("local_path"): notifiers.append(alerts.LocalNotifier(cfg["local_path"]))
+    return alerts.SignalAlerts(ALERTS_PATH, notifiers)
+
+def timeframe_view(data, tf):
+    """Snapshot + hasil analisis satu timeframe (H1 bila timeframe itu belum tersedia)."""
+    return {**data, **data['TF'].get(tf, data['TF']['H1'])}
+
+class MarketPoller:
+    """
+    Poller latar belakang (satu per proses) yang menyegarkan snapshot pasar bersama.
+    Hanya satu fetch berjalan pada satu waktu (single-flight), dan hasilnya dipublikasikan
+    ke SNAPSHOT_PATH agar proses worker lain cukup membaca file tanpa fetch ulang.
+    """
+    def __init__(self, interval=SNAPSHOT_INTERVAL, path=SNAPSHOT_PATH):
+        self.interval = interval; self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.snapshot = None; self.updated = 0.0
+        self._mtime = 0.0
+        self._busy = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="mafafx-poller", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while True:
+            try: self.refresh(wait=False)
+            except Exception as e: record_error("POLLER", e)
+            try: METRICS.export(METRICS_PATH)
+            except OSError: pass
+            time.sleep(SNAPSHOT_POLL_TICK)
+
+    def refresh(self, force=False, wait=True, sources=None):
+        if self._busy.acquire(blocking=False):
+            try: self._sync(force, sources)
+            finally: self._busy.release()
+        elif wait:
+            with self._busy: pass  # tunggu fetch yang sedang berjalan, jangan fetch ganda
+
+    def due_sources(self, min_interval=REFRESH_MIN_INTERVAL):
+        """
+        Sumber yang datanya (fetch sukses terakhir, proses mana pun) lebih tua dari interval minimumnya;
+        tiap gagal beruntun menggandakan jeda sampai REFRESH_BACKOFF_MAX. Belum pernah dicoba = due.
+        """
+        return get_source_attempts().due(min_interval)
+
+    def request_refresh(self, wait=REFRESH_WAIT):
+        """
+        Refresh manual (stale-while-revalidate): hanya sumber yang sudah lewat interval minimumnya
+        yang di-fetch ulang, di thread latar belakang; snapshot lama tetap dipakai sampai yang baru siap.
+        Banyak klik bersamaan hanya memicu satu fetch. Return daftar sumber yang dijadwalkan.
+        """
+        self._load_shared()
+        due = self.due_sources()
+        if not due or self._busy.locked(): return []
+        worker = threading.Thread(target=self.refresh, kwargs={'force': True, 'wait': False, 'sources': due},
+                                  name="mafafx-refresh", daemon=True)
+        worker.start(); worker.join(wait)
+        return due
+
+    def _is_fresh(self):
+        """Snapshot masih baru, atau build terakhir (proses mana pun) gagal dan jeda backoff-nya belum lewat."""
+        if time.time() - self.updated < self.interval: return True
+        return 'SNAPSHOT' not in get_source_attempts().due({'SNAPSHOT': self.interval})
+
+    def _sync(self, force, sources=None):
+        self._load_shared()
+        if not force and self._is_fresh(): return
+        with open(self.path + ".lock", "a") as lock:
+            if fcntl:
+                # Tanpa snapshot sama sekali: tunggu proses lain selesai lalu pakai hasilnya
+                flags = fcntl.LOCK_EX if self.snapshot is None else fcntl.LOCK_EX | fcntl.LOCK_NB
+                try: fcntl.flock(lock, flags)
+                except OSError: return  # proses lain sedang fetch
+                self._load_shared()
+                if not force and self._is_fresh(): return
+            data = None
+            try:
+                with span("snapshot.build"): data = build_market_snapshot(sources)
+            finally:
+                # Build gagal juga dicatat: sesi & tick poller berikutnya menunggu backoff, bukan fetch ulang tiap rerun
+                record_attempts({'SNAPSHOT': data is not None})
+            if data is None: return
+            # Evaluasi sinyal & alert sekali per snapshot bersama, bukan per sesi yang membuka halaman
+            try:
+                with span("alerts.process"): data['SIGNAL'] = get_signal_alerts().process(data)
+            except Exception as e:
+                record_error("ALERTS", e); data['SIGNAL'] = None
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f: pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self.path)
+            self.snapshot = data; self.updated = data['UPDATED']
+            self._mtime = os.path.getmtime(self.path)
+
+    def _load_shared(self):
+        try:
+            mtime = os.path.getmtime(self.path)
+            if mtime <= self._mtime: return
+            with open(self.path, "rb") as f: data = pickle.load(f)
+            if data.get('SCHEMA') != SNAPSHOT_SCHEMA: return
+            self.snapshot = data; self.updated = data['UPDATED']; self._mtime = mtime
+        except (OSError, EOFError, KeyError, pickle.UnpicklingError): pass
+
+@st.cache_resource
+def get_poller():
+    return MarketPoller().start()
+
+def fetch_market_data():
+    """Snapshot bersama; None selama belum ada build yang berhasil (build gagal dicoba ulang dengan backoff)."""
+    poller = get_poller()
+    if poller.snapshot is None: poller.refresh()
+    return poller.snapshot
+
+# ==========================================
+# 4. DASHBOARD UTAMA
+# ==========================================
+
+# --- SEKSI DASHBOARD ---
+# Seksi dengan widget dibungkus st.fragment: interaksi di dalamnya hanya me-rerun seksi itu.
+# Fragment membaca snapshot sendiri (hanya baca memori) agar rerun parsial memakai data terbaru.
+
+@span("render.matrix")
+def render_matrix(data):
+    dxy = data['DXY']; us10y = data['US10Y']; sentiment = data['SENTIMENT']; bias = data['BIAS']
+    st.markdown("### 🛡️ Fundamental Matrix (5-Point Check)")
+    m1, m2, m3, m4, m5 = st.columns(5)
+    
+    d_col = "#FF4B4B" if dxy['c'] > 0 else "#00CC96"
+    with m1: st.markdown(f"""<div class="matrix-card"><div class="matrix-title">1. USD (DXY)</div><div class="matrix-val" style="color:{d_col}">{dxy['c']:+.2f}%</div></div>""", unsafe_allow_html=True)
+    
+    u_col = "#FF4B4B" if us10y['chg'] > 0 else "#00CC96"
+    with m2: st.markdown(f"""<div class="matrix-card"><div class="matrix-title">2. US10Y YIELD</div><div class="matrix-val" style="color:{u_col}">{us10y['chg']:+.2f}%</div></div>""", unsafe_allow_html=True)
+    
+    r_val = sentiment['bullish']
+    r_col = "#00CC96" if r_val > 50 else "#FF4B4B"
+    with m3: st.markdown(f"""<div class="matrix-card"><div class="matrix-title">3. SENTIMENT</div><div class="matrix-val" style="color:{r_col}">{r_val:.0f}/100</div></div>""", unsafe_allow_html=True)
+    
+    n_count = len(data['NEWS']['today'])
+    n_col = "#FF4B4B" if n_count > 0 else "#FFFFFF"
+    with m4: st.markdown(f"""<div class="matrix-card"><div class="matrix-title">4. NEWS TODAY</div><div class="matrix-val" style="color:{n_col}">{n_count}</div></div>""", unsafe_allow_html=True)
+    
+    with m5: st.markdown(f"""<div class="matrix-card" style="border-color:{bias['color']};"><div class="matrix-title">5. BIAS ARAH</div><div class="matrix-val" style="color:{bias['color']}; font-size:1em;">{bias['text']}</div></div>""", unsafe_allow_html=True)
+
+@span("render.signal")
+def render_signal(data, live=None):
+    """live: override harga/perubahan dari live feed {'gold_p', 'gold_c', 'dxy_c'}."""
+    gold = data['GOLD']; sentiment = data['SENTIMENT']
+    gold_p, gold_c, dxy_c = (live['gold_p'], live['gold_c'], live['dxy_c']) if live else (gold['p'], gold['c'], data['DXY']['c'])
+    _, signal_text, signal_color = h1_signal(dxy_c, sentiment['net_score'], TF_PARAMS[data['TIMEFRAME']]['signal'])
+
+    # Logic Sesi Pasar
+    session_name, session_color = get_current_session_info()
+
+    st.markdown(f"""
+    <div class="signal-box">
+        <div class="signal-header-container">
+            <div class="session-badge" style="background-color: {session_color};">{session_name}</div>
+            <h1 style="margin:0; text-shadow: 0 0 15px {signal_color}; color: {signal_color}; font-size: 2.5em; display: inline-block;">{signal_text}</h1>
+        </div>
+        <h3 style="margin:5px 0 0 0; color: white;">XAU/USD: ${gold_p:,.2f}</h3>
+        <p style="margin:0; opacity:0.8; font-size: 0.9em;">Perubahan {TF_LABELS[data['TIMEFRAME']]}: {gold_c:.2f}%</p>
+    </div>
+    """, unsafe_allow_html=True)
+    closed = (data.get('SIGNAL') or {}).get('last')
+    if closed:
+        since = data['SIGNAL']['since'].get('signal', closed['bar'])
+        since = since[11:] if since[:10] == closed['bar'][:10] else since[5:]
+        st.caption(f"🔔 Bar H1 close {closed['bar'][11:]} WIB: {closed['signal']} (sejak {since}) · bias {closed['bias']}")
+
+@st.cache_resource
+def get_live_feed():
+    """Satu koneksi streaming per proses. st.secrets["live"]["feed"] = "simulated" untuk pengganti lokal."""
+    try: source = st.secrets["live"]["feed"]
+    except: source = "twelvedata"
+    api = None
+    if source != "simulated":
+        if livefeed.websocket is None: return None
+        try: api = st.secrets["twelvedata"]["api_key"]
+        except: return None
+    return livefeed.LiveFeed([GOLD_SYMBOL, USD_PROXY], source=source, api_key=api).start()
+
+@st.fragment(run_every=LIVE_PUSH_EVERY)
+@span("render.live_signal")
+def render_live_signal():
+    # Hanya membaca snapshot & bar live di memori; tidak ada polling REST. Agregator live = bar H1.
+    data = timeframe_view(fetch_market_data(), 'H1')
+    feed = get_live_feed()
+    if feed is None:
+        st.caption("⚠️ Live mode butuh paket websocket-client & API key Twelve Data.")
+        render_signal(data); return
+    feed.seed(data['UPDATED'], {GOLD_SYMBOL: data['GOLD']['bar'], USD_PROXY: data['DXY']['bar']})
+    g = feed.quote(GOLD_SYMBOL); d = feed.quote(USD_PROXY)
+    if not g or not d: render_signal(data); return
+    render_signal(data, {'gold_p': g['close'], 'gold_c': g['chg'], 'dxy_c': -d['chg']})
+    if g['updated']: st.caption(f"⚡ LIVE ({feed.source}) · tick terakhir {max(time.time() - g['updated'], 0):.0f} detik lalu")
+
+def level_box(label, value, color):
+    return (f'<div class="sr-box" style="border-color: {color}; margin-bottom: 5px;"><small style="color: {color};">{label}</small>'
+            f'<br><b style="font-size: 1.2em;">${value:,.2f}</b></div>')
+
+@st.fragment
+@span("render.levels")
+def render_levels():
+    data = timeframe_view(fetch_market_data(), st.session_state.get("timeframe", "H1"))
+    dxy = data['DXY']; us10y = data['US10Y']; sentiment = data['SENTIMENT']; bias = data['BIAS']
+    c_sr, c_outlook = st.columns([1, 2])
+    with c_sr:
+        st.markdown("### 🎯 Key Levels")
+        method = st.radio("Metode", list(LEVEL_METHODS), format_func=LEVEL_METHODS.get, horizontal=True,
+                          key="level_method", label_visibility="collapsed")
+        if method == 'session':
+            boxes = []
+            for name, lv in data.get('SESSIONS', {}).items():
+                a, b = SESSIONS[name]
+                boxes.append(f"<small>{SESSION_LABELS[name]} · {time.strftime('%d/%m', time.gmtime(lv['start'] + WIB_OFFSET))} "
+                             f"{a:02d}:00-{b:02d}:00 WIB</small>")
+                boxes.append(level_box("HIGH", lv['high'][GOLD_SYMBOL], "#FF4B4B"))
+                boxes.append(level_box("LOW", lv['low'][GOLD_SYMBOL], "#00CC96"))
+            if boxes: st.markdown("".join(boxes), unsafe_allow_html=True)
+            else: st.caption("Belum ada sesi yang selesai.")
+        else:
+            tf = data['TIMEFRAME']
+            st.caption(f"{LEVEL_METHODS[method]} · {LEVEL_WINDOW} bar {tf}" if method == 'range' else
+                       f"{LEVEL_METHODS[method]} · pivot {PIVOT_LABELS[TF_PIVOT[tf]]} (periode sebelumnya yang sudah close)")
+            levels = data['GOLD']['levels'].get(method, {})
+            colors = {'R': "#FF4B4B", 'P': "#FFD700", 'S': "#00CC96"}
+            boxes = "".join(level_box(k, v, colors[k[0]]) for k, v in levels.items() if v == v)
+            if boxes: st.markdown(boxes, unsafe_allow_html=True)
+            else: st.caption("Belum ada periode acuan yang close.")
+        
+    with c_outlook:
+        st.markdown("### 📢 Market Outlook")
+        outlook_text = f"Fundamental Bias: **{bias['text']}**. "
+        dxy_thr = TF_PARAMS[data['TIMEFRAME']]['bias']['dxy']
+        if dxy['c'] > dxy_thr: outlook_text += "Dolar menguat menekan Emas. "
+        elif dxy['c'] < -dxy_thr: outlook_text += "Dolar melemah mendukung Emas. "
+        if sentiment['bullish'] > 70: outlook_text += "Hati-hati Overbought."
+        elif sentiment['bullish'] < 30: outlook_text += "Hati-hati Oversold."
+        
+        st.markdown(f"""
+        <div class="outlook-box">
+            <p style="margin: 0; font-size: 1.1em; line-height: 1.6;">{outlook_text}</p>
+            <br>
+            <small>Teknikal RSI: <b>{sentiment['bullish']:.1f}/100</b> | Yield US10Y: <b>{us10y['chg']:+.2f}%</b></small>
+        </div>
+        """, unsafe_allow_html=True)
+
+@span("render.watchlist")
+def render_watchlist(data):
+    st.markdown(f"### 👀 Watchlist ({data['TIMEFRAME']})")
+    st.dataframe(data['WATCHLIST'], use_container_width=True, hide_index=True, column_config=WATCHLIST_FORMAT)
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def get_chart_figure(version, tf, bars, _gold_chart, _dxy_chart, _corr=None):
+    """Figure dibangun sekali per (versi snapshot, timeframe, rentang) lalu dipakai ulang oleh semua sesi."""
+    with span("chart.build"):
+        corr = None
+        if _corr is not None:
+            corr = _corr['chart'].tail(bars).to_frame()
+            corr = corr[[c for c in corr.columns if c.startswith("Korelasi")]]
+        return build_correlation_figure(_gold_chart.tail(bars).to_series(), _dxy_chart.tail(bars).to_series(), CHART_MAX_POINTS, corr)
+
+def correlation_caption(corr):
+    fmt = lambda v, spec: "–" if v != v else format(v, spec)
+    dxy = corr['latest']['DXY']; w = corr['bias_window']
+    text = (f"📐 Korelasi emas vs DXY ({'/'.join(map(str, dxy['corr']))} bar): "
+            f"{' / '.join(fmt(v, '+.2f') for v in dxy['corr'].values())}")
+    if w in dxy['corr']: text += f" · beta({w}) {fmt(dxy['beta'][w], '+.2f')} · z({w}) {fmt(dxy['z'][w], '+.1f')}"
+    u = corr['latest'].get('US10Y', {})
+    if w in u.get('corr', {}):
+        text += f" · vs US10Y({w}): korelasi {fmt(u['corr'][w], '+.2f')}, beta {fmt(u['beta'][w], '+.2f')}"
+    return text
+
+@st.fragment
+@span("render.chart")
+def render_chart():
+    data = timeframe_view(fetch_market_data(), st.session_state.get("timeframe", "H1"))
+    tf = data['TIMEFRAME']
+    st.markdown("### 🚦 Korelasi Arus Dolar vs Harga Emas")
+    bars = st.radio(f"Rentang (bar {tf})", CHART_RANGES, horizontal=True, key="chart_bars")
+    fig = get_chart_figure(data['UPDATED'], tf, bars, data['GOLD']['chart'], data['DXY']['chart'], data['CORR'])
+    st.plotly_chart(fig, use_container_width=True)
+    if data['CORR']: st.caption(correlation_caption(data['CORR']))
+
+@st.fragment
+@span("render.calendar")
+def render_calendar():
+    data = fetch_market_data()
+    c_news, c_tips = st.columns([2, 1])
+    with c_news:
+        currencies = get_calendar_currencies()
+        st.markdown(f"### 📰 Kalender {'/'.join(currencies)} (High Impact)")
+        nxt = get_calendar_store().next_event(time.time(), currencies, CALENDAR_IMPACTS)
+        if nxt:
+            mins = int(nxt['ts'] - time.time()) // 60
+            st.caption(f"⏰ Berikutnya: **{nxt['title']}** ({nxt['currency']}, {nxt['impact']}) dalam {mins // 60} jam {mins % 60} menit")
+        calendar = data['NEWS']['week']
+        if calendar.num_rows and st.toggle("High Impact saja", key="calendar_high_only"):
+            calendar = calendar.filter(pc.equal(calendar['Impact'], 'High'))
+        if calendar.num_rows: st.dataframe(calendar, use_container_width=True, hide_index=True)
+        else: st.info(f"Tidak ada berita High Impact {'/'.join(currencies)} minggu ini.")
+    
+    with c_tips:
+        st.info("💡 **Tips:** Selalu cek Matrix 5-Point di atas sebelum Entry. Jangan lawan Fundamental!")
+
+def is_admin():
+    """Username yang terdaftar di st.secrets["auth"]["admins"]."""
+    try: return st.session_state.get("username") in st.secrets["auth"]["admins"]
+    except: return False
+
+def render_metrics_panel():
+    with st.expander("📊 Metrics (admin)"):
+        st.caption(f"PID {os.getpid()} · uptime {(time.time() - METRICS.started) / 60:.0f} menit")
+        for title, rows, index in [("Tahap", METRICS.stage_rows(), 'stage'), ("Cache", METRICS.cache_rows(), 'cache'),
+                                   ("Error upstream", METRICS.error_rows(), 'source')]:
+            st.markdown(f"**{title}**")
+            if rows: st.dataframe(pd.DataFrame(rows).set_index(index).round(1), use_container_width=True)
+            else: st.caption("Belum ada data.")
+        st.download_button("⬇️ metrics.prom", METRICS.prometheus(), file_name="metrics.prom", mime="text/plain")
+
+@span("render.main")
+def main():
+    # --- SIDEBAR ---
+    with st.sidebar:
+        try: st.image("logo.png", width=150)
+        except: st.write("## 👑 MafaFX")
+        st.markdown("---")
+        st.write(f"User: **{st.session_state.get('username')}**")
+        st.caption("Status: Premium Active")
+        st.toggle("⚡ Live Mode", key="live_mode", help="Harga & sinyal diperbarui tiap beberapa detik dari feed streaming.")
+        if is_admin(): render_metrics_panel()
+        st.markdown("---")
+        if st.button("🚪 Logout (Keluar)"): logout()
+
+    # --- HEADER ---
+    col_head, col_act = st.columns([5, 2])
+    with col_head:
+        st.title("MafaFX Premium")
+        st.caption("⚡ Hybrid System: Fundamental Matrix + H1 Execution")
+    with col_act:
+        c1, c2 = st.columns(2)
+        with c1: 
+            if st.button("🔄 Refresh"):
+                due = get_poller().request_refresh()
+                st.toast(f"🔄 Memperbarui: {', '.join(due)}" if due else "✅ Data masih segar atau sedang diperbarui.")
+        with c2:
+            if st.button("🚫 Logout"): logout()
+
+    with st.spinner("Menggabungkan Data Fundamental & Teknikal..."), span("render.fetch"):
+        data = fetch_market_data()
+    if not data: st.warning("Menunggu data API (Pastikan API Key Valid)..."); return
+
+    # Semua timeframe sudah dianalisis di snapshot: ganti timeframe = lookup, tanpa request
+    tf = st.radio("Timeframe", list(TIMEFRAMES), index=list(TIMEFRAMES).index("H1"), horizontal=True, key="timeframe")
+    if tf not in data['TF']: st.caption(f"⚠️ Data {tf} belum tersedia, menampilkan H1.")
+    data = timeframe_view(data, tf)
+
+    degraded = [f"{k} ({v['state']})" for k, v in data['STATUS'].items() if v['state'] != 'ok']
+    if degraded: st.caption("⚠️ Sumber data tertunda/gagal: " + ", ".join(degraded))
+
+    render_matrix(data)
+    st.markdown("---")
+    if st.session_state.get("live_mode") and data['TIMEFRAME'] == 'H1': render_live_signal()
+    else:
+        if st.session_state.get("live_mode"): st.caption("⚡ Live mode hanya berlaku di timeframe H1.")
+        render_signal(data)
+    render_levels()
+    render_watchlist(data)
+    st.markdown("---")
+    render_chart()
+    render_calendar()
@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+import requests
+from pandas.tseries.frequencies import to_offset
+from barstore import to_epoch
+from config import WIB_OFFSET
+from indicators import rsi_series
+from metrics import record_error, span
+
+# ==========================================
+# ENGINE DATA: FETCH UPSTREAM & PENGOLAHAN (TANPA STREAMLIT)
+# ==========================================
+
+TWELVEDATA_URL = "https://api.twelvedata.com/time_series"
+US10Y_PERIOD = "1y"   # riwayat yield H1 untuk korelasi rolling D1/W1, setara MTF_LOOKBACK (^TNX 1h maks. 730 hari)
+
+def get_twelvedata(symbols, interval, api_key, timeout=10, **params):
+    """Satu request batch (symbol=A,B,C) untuk semua simbol. Return {symbol: values}, None bila gagal total."""
+    query = {'symbol': ",".join(symbols), 'interval': interval, 'apikey': api_key, 'outputsize': 50, 'timezone': 'UTC', **params}
+    try:
+        with span("upstream.twelvedata"): r = requests.get(TWELVEDATA_URL, params=query, timeout=timeout).json()
+        if "status" in r and r["status"] == "error": record_error("TWELVEDATA", kind="api"); return None
+        if len(symbols) == 1: r = {symbols[0]: r}
+        out = {s: (None if r.get(s, {}).get("status") == "error" else r.get(s, {}).get("values", [])) for s in symbols}
+        for s in symbols:
+            if out[s] is None: record_error("TWELVEDATA", kind="api")
+        return out
+    except Exception as e: record_error("TWELVEDATA", e); return None
+
+def get_us10y_data(timeout=10, period=US10Y_PERIOD):
+    """Yield ^TNX H1: harga & perubahan bar terakhir, plus 'series' = close per waktu close bar (UTC naive)."""
+    try:
+        import yfinance as yf  # berat; hanya dimuat proses yang benar-benar fetch US10Y
+        ticker = yf.Ticker("^TNX")
+        with span("upstream.yfinance"): df = ticker.history(period=period, interval="1h", timeout=timeout)
+        if df.empty: record_error("US10Y", kind="empty"); return None
+        curr = df['Close'].iloc[-1]
+        prev = df['Close'].iloc[-2]
+        chg = ((curr - prev) / prev) * 100
+        idx = df.index.tz_convert("UTC").tz_localize(None) + pd.Timedelta(hours=1)
+        return {'price': curr, 'chg': chg, 'series': pd.Series(df['Close'].to_numpy(dtype=float), index=idx)}
+    except Exception as e: record_error("US10Y", e); return None
+
+def calculate_rsi(prices, period=14):
+    try:
+        prices = np.array(prices).astype(float)
+        if len(prices) < period + 1: return 50.0
+        seed = np.diff(prices[:period+2])
+        if not (seed < 0).any(): return 100.0
+        return rsi_series(prices, (period,))[0, -1]
+    except Exception as e: record_error("RSI", e); return 50.0
+
+def process_data(bars, inverse=(), keep=500):
+    """
+    Satu pass kolumnar untuk semua simbol. bars: frame kolom (field, symbol).
+    Return: harga terakhir & perubahan bar terakhir per simbol, chart close, dan chart return
+    (simbol di `inverse` dibalik tandanya, mis. EUR/USD sebagai proxy DXY), `keep` bar terakhir.
+    """
+    if bars is None or bars.empty: return None
+    try:
+        close = bars['close'].dropna(axis=1, how='all')
+        close = close.set_axis(close.index + pd.Timedelta(seconds=WIB_OFFSET))
+        arr = close.to_numpy(); valid = ~np.isnan(arr); cols = np.arange(arr.shape[1])
+        enough = valid.sum(axis=0) >= 2
+        i1 = len(arr) - 1 - np.argmax(valid[::-1], axis=0)
+        valid[i1, cols] = False
+        i0 = len(arr) - 1 - np.argmax(valid[::-1], axis=0)
+        curr = np.where(enough, arr[i1, cols], np.nan); prev = np.where(enough, arr[i0, cols], np.nan)
+        sign = np.where(close.columns.isin(list(inverse)), -1.0, 1.0)
+        ret = close.pct_change(fill_method=None) * sign
+        return {
+            'p': pd.Series(curr, index=close.columns),
+            'c': pd.Series(sign * (curr - prev) / prev * 100, index=close.columns),
+            'chart': close.tail(keep), 'ret': ret.tail(keep),
+        }
+    except Exception as e: record_error("PROCESS_DATA", e); return None
+
+def resample_bars(bars, rule, origin='start_day'):
+    """
+    Frame kolumnar (field, symbol) -> timeframe lebih tinggi untuk semua simbol sekaligus.
+    Bucket tanpa bar (akhir pekan/libur) dibuang; bucket terakhir bisa masih berjalan.
+    `origin` hanya berlaku untuk aturan berdurasi tetap ('4h', '168h'); aturan kalender ('MS') mulai di awal bulan.
+    """
+    if bars is None or bars.empty: return None
+    how = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+    fields = [f for f in how if f in bars.columns.get_level_values(0)]
+    kw = {'origin': origin} if isinstance(to_offset(rule), pd.offsets.Tick) else {}
+    out = pd.concat({f: getattr(bars[f].resample(rule, **kw), how[f])() for f in fields}, axis=1)
+    return out[out['close'].notna().any(axis=1)]
+
+def yield_change(yields, start, end=None):
+    """
+    Perubahan % yield dari close bar sebelumnya (asof `start` = awal bar) ke nilai terakhir, atau ke nilai
+    asof `end` (akhir bar yang sudah close), padanan perubahan harga bar itu pada timeframe mana pun.
+    yields: seri per waktu close (UTC naive).
+    """
+    if yields is None or not len(yields): return np.nan
+    y = yields.sort_index()
+    prev = y.asof(start); curr = y.iloc[-1] if end is None else y.asof(end)
+    return float((curr - prev) / prev * 100)
+
+def aligned_returns(bars, gold, usd_proxy, yields=None, step=pd.Timedelta(hours=1)):
+    """
+    Return per bar emas, proxy DXY (return `usd_proxy` dibalik) dan yield US10Y, pada bar yang kedua simbol punya close.
+    Yield diambil asof waktu close bar (index + `step`), tanpa look-ahead. bar terakhir = bar berjalan.
+    Return (ts epoch detik, gold, dxy, us10y); us10y NaN sebelum riwayat yield tersedia.
+    """
+    close = bars['close'][[gold, usd_proxy]].dropna()
+    ret = close.pct_change(fill_method=None).iloc[1:]
+    us10y = np.full(len(ret), np.nan)
+    if yields is not None and len(yields):
+        y = yields.sort_index().asof(close.index + step).to_numpy(dtype=float)
+        us10y = np.diff(y) / y[:-1]
+    ts = to_epoch(ret.index)
+    return ts, ret[gold].to_numpy(), -ret[usd_proxy].to_numpy(), us10y
+
+def last_bar(bars, symbol):
+    """Bar terakhir (UTC epoch) + close sebelumnya, untuk seed agregator live feed."""
+    b = bars.xs(symbol, axis=1, level=1).dropna().iloc[-2:]
+    if len(b) < 2: return None
+    start = int(to_epoch(b.index[-1:])[0])
+    return {'start': start, 'open': b['open'].iloc[-1], 'high': b['high'].iloc[-1], 'low': b['low'].iloc[-1],
+            'close': b['close'].iloc[-1], 'prev_close': b['close'].iloc[-2]}
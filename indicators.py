@@ -0,0 +1,226 @@
+import numpy as np
+
+# ==========================================
+# ENGINE INDIKATOR (VEKTOR NUMPY + STATE INKREMENTAL)
+# ==========================================
+
+def _as_periods(periods):
+    p = np.atleast_1d(np.asarray(periods, dtype=np.int64))
+    if (p < 2).any(): raise ValueError("Periode indikator minimal 2")
+    return p
+
+def smooth(x, alpha, y0, start):
+    """
+    Smoothing eksponensial y[i] = (1 - alpha) * y[i-1] + alpha * x[i] untuk banyak periode sekaligus.
+    x: (n,); alpha, y0, start: (k,). Kolom <= start bernilai y0, rekursi dimulai dari start + 1.
+    Dihitung per blok dengan cumsum berbobot; ukuran blok dibatasi agar bobot d^-B <= 1e3 (presisi ~1e-13).
+    Return: array (k, n).
+    """
+    x = np.asarray(x, dtype=float); n = len(x)
+    alpha = np.asarray(alpha, dtype=float)[:, None]; y0 = np.asarray(y0, dtype=float)
+    xs = np.where(np.arange(n)[None, :] <= np.asarray(start)[:, None], y0[:, None], x[None, :])
+    d = 1.0 - alpha
+    block = max(1, int(np.log(1e3) / -np.log(d.min())))
+    pw = d ** np.arange(1, block + 1)[None, :]
+    y = np.empty((len(y0), n)); prev = y0
+    for s in range(0, n, block):
+        blk = xs[:, s:s + block]; p = pw[:, :blk.shape[1]]
+        yb = p * (prev[:, None] + alpha * np.cumsum(blk / p, axis=1))
+        y[:, s:s + blk.shape[1]] = yb; prev = yb[:, -1]
+    return y
+
+def _rsi_parts(close, p):
+    """Rata-rata naik/turun Wilder, seed identik dengan calculate_rsi lama (p+1 delta pertama / p)."""
+    n = len(close)
+    deltas = np.diff(close)
+    gain = np.maximum(deltas, 0.0); loss = np.maximum(-deltas, 0.0)
+    seed_end = np.minimum(p + 1, n - 1)
+    cg = np.concatenate(([0.0], np.cumsum(gain))); cl = np.concatenate(([0.0], np.cumsum(loss)))
+    up = smooth(np.concatenate(([0.0], gain)), 1.0 / p, cg[seed_end] / p, p - 1)
+    down = smooth(np.concatenate(([0.0], loss)), 1.0 / p, cl[seed_end] / p, p - 1)
+    return up, down
+
+def _rsi_from(up, down):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100. - 100. / (1. + up / down)
+
+def rsi_series(close, periods=(14,)):
+    """Seri RSI penuh (k, n). Baris dengan data < periode + 1 bernilai 50."""
+    close = np.asarray(close, dtype=float); p = _as_periods(periods)
+    out = np.full((len(p), len(close)), 50.0)
+    rows = p + 1 <= len(close)
+    if rows.any():
+        up, down = _rsi_parts(close, p[rows])
+        out[rows] = _rsi_from(up, down)
+    return out
+
+def ema_series(x, periods=(20,)):
+    """EMA (seed SMA periode pertama) untuk banyak periode. Return (k, n), NaN selama warm-up."""
+    x = np.asarray(x, dtype=float); p = _as_periods(periods); n = len(x)
+    out = np.full((len(p), n), np.nan)
+    rows = p <= n
+    if rows.any():
+        pv = p[rows]
+        y = smooth(x, 2.0 / (pv + 1), np.cumsum(x)[pv - 1] / pv, pv - 1)
+        y[np.arange(n)[None, :] < (pv - 1)[:, None]] = np.nan
+        out[rows] = y
+    return out
+
+def true_range(high, low, close):
+    high = np.asarray(high, dtype=float); low = np.asarray(low, dtype=float); close = np.asarray(close, dtype=float)
+    prev = np.concatenate(([close[0]], close[:-1])) if len(close) else close
+    tr = np.maximum(high - low, np.maximum(np.abs(high - prev), np.abs(low - prev)))
+    if len(tr): tr[0] = high[0] - low[0]
+    return tr
+
+def atr_series(high, low, close, periods=(14,)):
+    """ATR Wilder (seed rata-rata TR periode pertama). Return (k, n), NaN selama warm-up."""
+    tr = true_range(high, low, close); p = _as_periods(periods); n = len(tr)
+    out = np.full((len(p), n), np.nan)
+    rows = p <= n
+    if rows.any():
+        pv = p[rows]
+        y = smooth(tr, 1.0 / pv, np.cumsum(tr)[pv - 1] / pv, pv - 1)
+        y[np.arange(n)[None, :] < (pv - 1)[:, None]] = np.nan
+        out[rows] = y
+    return out
+
+def macd_series(close, fast=12, slow=26, signal=9):
+    """Return (3, n): garis MACD, signal, histogram."""
+    close = np.asarray(close, dtype=float); n = len(close)
+    fs = ema_series(close, (fast, slow))
+    line = fs[0] - fs[1]
+    sig = np.full(n, np.nan)
+    if n - (slow - 1) >= signal: sig[slow - 1:] = ema_series(line[slow - 1:], (signal,))[0]
+    return np.vstack([line, sig, line - sig])
+
+def _regression(n, sx, sy, sxx, syy, sxy, x, y):
+    """Korelasi, beta & z-score residual y ~ x dari jumlah-jumlah window (broadcast bebas bentuk)."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mx = sx / n; my = sy / n
+        vx = sxx / n - mx * mx; vy = syy / n - my * my; cxy = sxy / n - mx * my
+        # varians ~0 (mis. yield tidak bergerak sepanjang window) -> tidak terdefinisi
+        ok = (vx > 1e-10 * sxx / n) & (vy > 1e-10 * syy / n)
+        corr = np.where(ok, cxy / np.sqrt(vx * vy), np.nan)
+        beta = np.where(ok, cxy / vx, np.nan)
+        resid_sd = np.sqrt(np.maximum(vy * (1 - corr * corr), 0))
+        z = np.where(ok & (resid_sd > 0), (y - (my - beta * mx) - beta * x) / resid_sd, np.nan)
+    return {'corr': corr, 'beta': beta, 'z': z}
+
+def rolling_stats(x, y, windows=(20,)):
+    """
+    Korelasi, beta (cov/var x) & z-score residual regresi y ~ x rolling untuk banyak window sekaligus,
+    satu pass cumsum (O(n) per window). z = seberapa jauh y bar ini dari yang dijelaskan x, dalam sigma residual.
+    x, y: (n,) tanpa NaN, mis. return emas vs return proxy DXY. Return dict (k, n), NaN selama warm-up.
+    """
+    x = np.asarray(x, dtype=float); y = np.asarray(y, dtype=float); w = _as_periods(windows)[:, None]
+    end = np.arange(1, len(x) + 1)[None, :]; start = np.maximum(end - w, 0)
+    sums = []
+    for a in (x, y, x * x, y * y, x * y):
+        c = np.concatenate(([0.0], np.cumsum(a)))
+        sums.append(c[end] - c[start])
+    out = _regression(w.astype(float), *sums, x[None, :], y[None, :])
+    warm = end < w
+    for v in out.values(): v[warm] = np.nan
+    return out
+
+class RollingStats:
+    """
+    Versi inkremental rolling_stats: compute() sekali (vektor), lalu tiap bar baru cukup update() O(k):
+    jumlah per window ditambah nilai baru dan dikurangi nilai yang keluar window (dibaca dari ring buffer).
+    update(..., commit=False) menghitung bar yang masih berjalan tanpa mengubah state.
+    """
+    def __init__(self, windows=(20,)):
+        self.windows = _as_periods(windows)
+        self.state = None
+
+    def compute(self, x, y):
+        x = np.asarray(x, dtype=float); y = np.asarray(y, dtype=float); n = len(x)
+        out = rolling_stats(x, y, self.windows)
+        m = int(self.windows.max())
+        buf = np.zeros((2, m)); idx = np.arange(max(0, n - m), n)
+        buf[0, idx % m] = x[idx]; buf[1, idx % m] = y[idx]
+        sums = np.zeros((len(self.windows), 5))
+        for i, w in enumerate(self.windows):
+            xs, ys = x[max(0, n - w):], y[max(0, n - w):]
+            sums[i] = [xs.sum(), ys.sum(), (xs * xs).sum(), (ys * ys).sum(), (xs * ys).sum()]
+        self.state = {'sums': sums, 'count': n, 'buf': buf}
+        return out
+
+    def update(self, x, y, commit=True):
+        """Nilai terbaru per window: {'corr': (k,), 'beta': (k,), 'z': (k,)}."""
+        s = self.state; m = s['buf'].shape[1]; count = s['count']
+        full = count >= self.windows
+        old = s['buf'][:, (count - self.windows) % m]
+        old = np.where(full, old, 0.0)
+        ox, oy = old
+        sums = s['sums'] + np.array([x, y, x * x, y * y, x * y])[None, :] - np.stack([ox, oy, ox * ox, oy * oy, ox * oy], axis=1)
+        if commit:
+            s['buf'][:, count % m] = (x, y)
+            s['sums'] = sums; s['count'] = count + 1
+        out = _regression(self.windows.astype(float), *sums.T, x, y)
+        warm = count + 1 < self.windows
+        for v in out.values(): v[warm] = np.nan
+        return out
+
+class IndicatorEngine:
+    """
+    compute() menghitung seri penuh secara vektor dan menyimpan state smoothing terakhir,
+    sehingga tiap bar baru cukup diproses update() dalam O(1) per periode.
+    update(..., commit=False) menghitung bar yang masih berjalan tanpa mengubah state.
+    """
+    def __init__(self, rsi=(14,), ema=(20, 50), atr=(14,), macd=(12, 26, 9)):
+        self.rsi_p = _as_periods(rsi); self.ema_p = _as_periods(ema); self.atr_p = _as_periods(atr)
+        self.macd_p = tuple(macd)
+        self.state = None
+
+    def compute(self, high, low, close):
+        """Seri penuh (k, n) per indikator; butuh minimal satu bar."""
+        high = np.asarray(high, dtype=float); low = np.asarray(low, dtype=float); close = np.asarray(close, dtype=float)
+        fast, slow, sig = self.macd_p
+        series = {
+            'rsi': rsi_series(close, self.rsi_p),
+            'ema': ema_series(close, self.ema_p),
+            'atr': atr_series(high, low, close, self.atr_p),
+            'macd': macd_series(close, fast, slow, sig),
+        }
+        fs = ema_series(close, (fast, slow))
+        up = np.full(len(self.rsi_p), np.nan); down = up.copy()
+        rows = self.rsi_p + 1 <= len(close)
+        if rows.any():
+            u, d = _rsi_parts(close, self.rsi_p[rows])
+            up[rows] = u[:, -1]; down[rows] = d[:, -1]
+        self.state = {
+            'close': close[-1], 'up': up, 'down': down,
+            'ema': series['ema'][:, -1], 'atr': series['atr'][:, -1],
+            'fast': fs[0, -1], 'slow': fs[1, -1], 'signal': series['macd'][1, -1],
+        }
+        return series
+
+    def update(self, high, low, close, commit=True):
+        s = self.state
+        p = self.rsi_p; fast, slow, sig = self.macd_p
+        delta = close - s['close']
+        up = (s['up'] * (p - 1) + max(delta, 0.0)) / p
+        down = (s['down'] * (p - 1) + max(-delta, 0.0)) / p
+        ema = s['ema'] + 2.0 / (self.ema_p + 1) * (close - s['ema'])
+        tr = max(high - low, abs(high - s['close']), abs(low - s['close']))
+        atr = (s['atr'] * (self.atr_p - 1) + tr) / self.atr_p
+        f = s['fast'] + 2.0 / (fast + 1) * (close - s['fast'])
+        sl = s['slow'] + 2.0 / (slow + 1) * (close - s['slow'])
+        signal = s['signal'] + 2.0 / (sig + 1) * ((f - sl) - s['signal'])
+        new = {'close': close, 'up': up, 'down': down, 'ema': ema, 'atr': atr, 'fast': f, 'slow': sl, 'signal': signal}
+        if commit: self.state = new
+        return self.values(new)
+
+    def values(self, state=None):
+        """Nilai indikator terakhir: {'rsi': {14: ..}, 'ema': {20: ..}, 'atr': {14: ..}, 'macd': {...}}."""
+        s = state or self.state
+        rsi = np.nan_to_num(_rsi_from(s['up'], s['down']), nan=50.0)
+        line = s['fast'] - s['slow']
+        return {
+            'rsi': dict(zip(self.rsi_p.tolist(), rsi.tolist())),
+            'ema': dict(zip(self.ema_p.tolist(), np.asarray(s['ema']).tolist())),
+            'atr': dict(zip(self.atr_p.tolist(), np.asarray(s['atr']).tolist())),
+            'macd': {'macd': float(line), 'signal': float(s['signal']), 'hist': float(line - s['signal'])},
+        }
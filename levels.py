@@ -0,0 +1,109 @@
+import time
+import numpy as np
+from config import WIB_OFFSET
+
+# ==========================================
+# KEY LEVEL: PIVOT MULTI-METODE & HIGH/LOW SESI (VEKTOR NUMPY)
+# ==========================================
+
+LEVEL_WINDOW = 24   # bar referensi metode 'range' (rolling, timeframe aktif)
+ATR_MULTIPLIERS = (1, 2)
+SESSION_SETTLE = 3600   # tanpa bar baru (akhir pekan), sesi dianggap final 1 jam setelah tutup
+
+# Jam WIB [mulai, selesai). London & New York bertumpuk 19-23 (badge "OVERLAP" di dashboard).
+SESSIONS = {'ASIA': (4, 14), 'LONDON': (14, 23), 'NEW_YORK': (19, 4)}
+
+def active_sessions(hour):
+    """Sesi yang sedang buka pada jam WIB `hour`."""
+    return [name for name, (a, b) in SESSIONS.items() if (a <= hour < b if a < b else hour >= a or hour < b)]
+
+def reference_range(high, low, close, window=LEVEL_WINDOW):
+    """
+    H/L/rata-rata close `window` bar terakhir untuk semua simbol sekaligus. high/low/close: (n, s), NaN = tidak ada bar.
+    Return (high, low, rata-rata close), masing-masing (s,).
+    """
+    h = high[-window:]; l = low[-window:]; c = close[-window:]
+    valid = ~np.isnan(c)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(valid, c, 0).sum(axis=0) / valid.sum(axis=0)
+    return np.fmax.reduce(h, axis=0), np.fmin.reduce(l, axis=0), mean
+
+def last_closed(high, low, close, end, now=None):
+    """
+    H/L/C periode terakhir yang sudah close per simbol dari frame periode lebih tinggi (mis. D1 untuk pivot
+    intraday). high/low/close: (n, s); end: (n,) epoch UTC akhir tiap periode, periode dengan end > now masih
+    berjalan dan diabaikan. Return (high, low, close) masing-masing (s,), NaN bila simbol belum punya periode close.
+    """
+    now = time.time() if now is None else now
+    closed = np.asarray(end) <= now
+    h, l, c = (np.asarray(a, dtype=float)[closed] for a in (high, low, close))
+    if not len(c): return tuple(np.full(c.shape[1], np.nan) for _ in range(3))
+    valid = ~np.isnan(c); ok = valid.any(axis=0)
+    last = len(c) - 1 - np.argmax(valid[::-1], axis=0); cols = np.arange(c.shape[1])
+    return tuple(np.where(ok, a[last, cols], np.nan) for a in (h, l, c))
+
+def key_levels(high, low, close, prev, atr=None, window=LEVEL_WINDOW):
+    """
+    Key level semua simbol sekaligus. 'range' (perilaku lama, dipakai watchlist): high/low/rata-rata close
+    `window` bar terakhir timeframe aktif (n, s). Pivot classic/fibonacci/camarilla/atr: dari `prev` = (H, L, C) (s,)
+    periode lebih tinggi terakhir yang sudah close (last_closed), jadi tetap sepanjang periode berjalan.
+    atr: (s,) ATR per simbol (dari engine indikator) untuk band ATR; None = band tidak dihitung.
+    Return {metode: {level: (s,)}}, urutan level: resistance tertinggi -> pivot -> support terendah.
+    """
+    H, L, M = reference_range(np.asarray(high, dtype=float), np.asarray(low, dtype=float), np.asarray(close, dtype=float), window)
+    out = {'range': {'R1': H, 'P': M, 'S1': L}}
+    H, L, C = (np.asarray(a, dtype=float) for a in prev)
+    r = H - L; P = (H + L + C) / 3
+    out.update({
+        'classic': {'R3': H + 2 * (P - L), 'R2': P + r, 'R1': 2 * P - L, 'P': P, 'S1': 2 * P - H, 'S2': P - r, 'S3': L - 2 * (H - P)},
+        'fibonacci': {'R3': P + r, 'R2': P + 0.618 * r, 'R1': P + 0.382 * r, 'P': P, 'S1': P - 0.382 * r, 'S2': P - 0.618 * r, 'S3': P - r},
+        # Camarilla berpusat di close periode sebelumnya, bukan pivot
+        'camarilla': {**{f'R{i}': C + r * 1.1 / d for i, d in ((4, 2), (3, 4), (2, 6), (1, 12))},
+                      **{f'S{i}': C - r * 1.1 / d for i, d in ((1, 12), (2, 6), (3, 4), (4, 2))}},
+    })
+    if atr is not None:
+        atr = np.asarray(atr, dtype=float)
+        out['atr'] = {**{f'R{k}': P + k * atr for k in ATR_MULTIPLIERS[::-1]}, 'P': P, **{f'S{k}': P - k * atr for k in ATR_MULTIPLIERS}}
+    return out
+
+def last_session_window(name, ts, now=None, lookback_days=7):
+    """
+    (start, end, i, j) sesi `name` terakhir yang sudah close dan punya bar: epoch UTC [start, end) dan potongan
+    indeks bar ts[i:j]. Sesi close bila sudah ada bar yang mulai pada/lewat jam tutupnya (bar terakhir sesi
+    sudah final), atau SESSION_SETTLE detik setelah tutup menurut jam `now`. None bila tidak ada.
+    """
+    if not len(ts): return None
+    now = time.time() if now is None else now
+    a, b = SESSIONS[name]
+    last = int(ts[-1]); duration = (b - a) % 24 * 3600
+    midnight = (int(max(now, last)) + WIB_OFFSET) // 86400 * 86400 - WIB_OFFSET   # 00:00 WIB hari ini, dalam epoch UTC
+    for k in range(lookback_days + 1):
+        end = midnight - k * 86400 + b * 3600
+        if end > last and end + SESSION_SETTLE > now: continue
+        start = end - duration
+        i, j = np.searchsorted(ts, [start, end])
+        if j > i: return start, end, int(i), int(j)  # akhir pekan/libur: mundur ke sesi terakhir yang ada barnya
+    return None
+
+class SessionLevels:
+    """
+    High/low sesi Asia/London/New York terakhir yang sudah close, per simbol. Tiap sesi dihitung sekali saat
+    close lalu disimpan; pemanggilan berikutnya (rerun, snapshot baru di tengah sesi lain) cukup lookup.
+    """
+    def __init__(self):
+        self._cache = {}   # sesi -> (end, symbols, high, low)
+
+    def update(self, ts, high, low, symbols, now=None):
+        """ts: (n,) epoch UTC awal bar, urut naik; high/low: (n, s). Return {sesi: {'start', 'end', 'high', 'low'}}."""
+        out = {}
+        symbols = tuple(symbols)
+        for name in SESSIONS:
+            win = last_session_window(name, ts, now)
+            if win is None: continue
+            start, end, i, j = win
+            cached = self._cache.get(name)
+            if cached is None or cached[0] != end or cached[1] != symbols:
+                cached = self._cache[name] = (end, symbols, np.fmax.reduce(high[i:j], axis=0), np.fmin.reduce(low[i:j], axis=0))
+            out[name] = {'start': start, 'end': end,
+                         'high': dict(zip(symbols, cached[2].tolist())), 'low': dict(zip(symbols, cached[3].tolist()))}
+        return out
@@ -0,0 +1,120 @@
+import json
+import math
+import random
+import threading
+import time
+
+try: import websocket
+except ImportError: websocket = None
+
+# ==========================================
+# LIVE FEED (STREAMING TICK -> BAR H1 DI MEMORI)
+# ==========================================
+
+TWELVEDATA_WS_URL = "wss://ws.twelvedata.com/v1/quotes/price?apikey={}"
+HEARTBEAT_EVERY = 10
+
+class BarAggregator:
+    """Bar berjalan untuk satu simbol, dibangun dari tick. Bar lama di-roll saat tick melewati batas interval."""
+    __slots__ = ('interval', 'start', 'open', 'high', 'low', 'close', 'prev_close', 'ticks', 'updated')
+
+    def __init__(self, interval=3600):
+        self.interval = interval
+        self.start = None; self.open = self.high = self.low = self.close = self.prev_close = None
+        self.ticks = 0; self.updated = None
+
+    def seed(self, bar):
+        """Sinkron dengan bar REST terakhir: {'start', 'open', 'high', 'low', 'close', 'prev_close'}."""
+        if self.start is None or bar['start'] > self.start:
+            self.start = bar['start']; self.open = bar['open']; self.high = bar['high']; self.low = bar['low']
+            self.close = bar['close']; self.prev_close = bar['prev_close']; self.ticks = 0
+        elif bar['start'] == self.start:
+            self.open = bar['open']; self.prev_close = bar['prev_close']
+            self.high = max(self.high, bar['high']); self.low = min(self.low, bar['low'])
+            if not self.ticks: self.close = bar['close']
+
+    def add(self, price, ts):
+        start = ts - ts % self.interval
+        if self.start is not None and start < self.start: return
+        if self.start is None or start > self.start:
+            if self.start is not None: self.prev_close = self.close
+            self.start = start; self.open = self.high = self.low = self.close = price; self.ticks = 0
+        else:
+            self.high = max(self.high, price); self.low = min(self.low, price); self.close = price
+        self.ticks += 1; self.updated = ts
+
+    def quote(self):
+        if self.close is None: return None
+        chg = (self.close - self.prev_close) / self.prev_close * 100 if self.prev_close else 0.0
+        return {'start': self.start, 'open': self.open, 'high': self.high, 'low': self.low,
+                'close': self.close, 'chg': chg, 'ticks': self.ticks, 'updated': self.updated}
+
+class TwelveDataStream(threading.Thread):
+    """Websocket harga Twelve Data dengan heartbeat dan reconnect (backoff eksponensial)."""
+    def __init__(self, api_key, symbols, on_tick):
+        super().__init__(name="mafafx-live", daemon=True)
+        self.api_key = api_key; self.symbols = symbols; self.on_tick = on_tick
+
+    def run(self):
+        backoff = 1
+        while True:
+            try:
+                ws = websocket.create_connection(TWELVEDATA_WS_URL.format(self.api_key), timeout=15)
+                ws.settimeout(HEARTBEAT_EVERY / 2)
+                ws.send(json.dumps({"action": "subscribe", "params": {"symbols": ",".join(self.symbols)}}))
+                last_hb = time.monotonic(); backoff = 1
+                while True:
+                    if time.monotonic() - last_hb > HEARTBEAT_EVERY:
+                        ws.send(json.dumps({"action": "heartbeat"})); last_hb = time.monotonic()
+                    try: msg = json.loads(ws.recv())
+                    except websocket.WebSocketTimeoutException: continue
+                    if msg.get("event") == "price":
+                        self.on_tick(msg["symbol"], float(msg["price"]), int(msg["timestamp"]))
+            except Exception:
+                time.sleep(backoff); backoff = min(backoff * 2, 60)
+
+class SimulatedStream(threading.Thread):
+    """Pengganti lokal untuk testing: random walk dari harga terakhir tiap simbol."""
+    def __init__(self, symbols, on_tick, last_price, every=1.0, vol=0.0002):
+        super().__init__(name="mafafx-live-sim", daemon=True)
+        self.symbols = symbols; self.on_tick = on_tick; self.last_price = last_price
+        self.every = every; self.vol = vol
+
+    def run(self):
+        while True:
+            for s in self.symbols:
+                p = self.last_price(s)
+                if p: self.on_tick(s, p * math.exp(random.gauss(0, self.vol)), int(time.time()))
+            time.sleep(self.every)
+
+class LiveFeed:
+    """Satu feed per proses; tick diagregasi ke bar berjalan per simbol, dibaca sesi lewat quote()."""
+    def __init__(self, symbols, source="twelvedata", api_key=None, interval=3600):
+        self.symbols = list(symbols); self.source = source
+        self._bars = {s: BarAggregator(interval) for s in self.symbols}
+        self._lock = threading.Lock()
+        self._seeded_version = None
+        if source == "simulated": self._stream = SimulatedStream(self.symbols, self.on_tick, self._last_price)
+        else: self._stream = TwelveDataStream(api_key, self.symbols, self.on_tick)
+
+    def start(self):
+        self._stream.start()
+        return self
+
+    def _last_price(self, symbol):
+        with self._lock: return self._bars[symbol].close
+
+    def on_tick(self, symbol, price, ts):
+        with self._lock:
+            if symbol in self._bars: self._bars[symbol].add(price, ts)
+
+    def seed(self, version, bars):
+        """Sinkron dengan snapshot REST (sekali per versi snapshot). bars: {symbol: bar dict}."""
+        if version == self._seeded_version: return
+        with self._lock:
+            for s, bar in bars.items():
+                if s in self._bars and bar: self._bars[s].seed(bar)
+            self._seeded_version = version
+
+    def quote(self, symbol):
+        with self._lock: return self._bars[symbol].quote()
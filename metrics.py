@@ -0,0 +1,108 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# ==========================================
+# METRIK: DURASI TAHAP, CACHE & ERROR UPSTREAM (TEKS PROMETHEUS)
+# ==========================================
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+class Metrics:
+    """
+    Registry per proses (thread-safe): histogram durasi per tahap, hit/miss/umur per entri cache,
+    dan jumlah error/timeout per sumber upstream. Dibaca panel admin & diekspor sebagai teks Prometheus.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self._stages = {}   # stage -> [count, sum, max, last, bucket counts]
+        self._caches = {}   # cache -> {'calls', 'misses', 'entries': {entry: waktu compute terakhir}}
+        self._errors = {}   # (source, kind) -> count
+
+    @contextmanager
+    def span(self, stage):
+        t0 = time.perf_counter()
+        try: yield
+        finally: self.observe(stage, time.perf_counter() - t0)
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            s = self._stages.get(stage)
+            if s is None: s = self._stages[stage] = [0, 0.0, 0.0, 0.0, [0] * len(BUCKETS)]
+            s[0] += 1; s[1] += seconds; s[2] = max(s[2], seconds); s[3] = seconds
+            for i, le in enumerate(BUCKETS):
+                if seconds <= le: s[4][i] += 1
+
+    def _cache(self, name):
+        c = self._caches.get(name)
+        if c is None: c = self._caches[name] = {'calls': 0, 'misses': 0, 'entries': {}}
+        return c
+
+    def cache_call(self, name):
+        with self._lock: self._cache(name)['calls'] += 1
+
+    def cache_miss(self, name, entry):
+        """Dipanggil dari dalam body fungsi cache: body hanya jalan saat entri tidak ada/kedaluwarsa."""
+        with self._lock:
+            c = self._cache(name); c['misses'] += 1; c['entries'][entry] = time.time()
+
+    def error(self, source, exc=None, kind=None):
+        """Hitung kegagalan upstream. kind default: 'timeout' untuk exception timeout, selain itu 'error'."""
+        if kind is None: kind = 'timeout' if exc is not None and 'timeout' in type(exc).__name__.lower() else 'error'
+        with self._lock: self._errors[(source, kind)] = self._errors.get((source, kind), 0) + 1
+
+    def stage_rows(self):
+        with self._lock:
+            return [{'stage': k, 'count': s[0], 'mean_ms': s[1] / s[0] * 1e3, 'last_ms': s[3] * 1e3, 'max_ms': s[2] * 1e3}
+                    for k, s in sorted(self._stages.items())]
+
+    def cache_rows(self):
+        now = time.time()
+        with self._lock:
+            return [{'cache': k, 'entry': e, 'hits': c['calls'] - c['misses'], 'misses': c['misses'], 'age_s': now - ts}
+                    for k, c in sorted(self._caches.items()) for e, ts in c['entries'].items()]
+
+    def error_rows(self):
+        with self._lock:
+            return [{'source': s, 'kind': k, 'count': n} for (s, k), n in sorted(self._errors.items())]
+
+    def prometheus(self):
+        """Format teks eksposisi Prometheus (dipakai textfile collector node_exporter atau scrape manual)."""
+        now = time.time(); pid = os.getpid(); out = []
+        with self._lock:
+            out += ["# HELP mafafx_stage_seconds Durasi tiap tahap fetch/olah/render.", "# TYPE mafafx_stage_seconds histogram"]
+            for stage, (count, total, _, _, buckets) in sorted(self._stages.items()):
+                lbl = f'pid="{pid}",stage="{_label(stage)}"'
+                out += [f'mafafx_stage_seconds_bucket{{{lbl},le="{le}"}} {n}' for le, n in zip(BUCKETS, buckets)]
+                out += [f'mafafx_stage_seconds_bucket{{{lbl},le="+Inf"}} {count}',
+                        f'mafafx_stage_seconds_sum{{{lbl}}} {total:.6f}', f'mafafx_stage_seconds_count{{{lbl}}} {count}']
+            out += ["# HELP mafafx_cache_requests_total Panggilan fungsi cache per hasil.", "# TYPE mafafx_cache_requests_total counter"]
+            for name, c in sorted(self._caches.items()):
+                lbl = f'pid="{pid}",cache="{_label(name)}"'
+                out += [f'mafafx_cache_requests_total{{{lbl},result="hit"}} {c["calls"] - c["misses"]}',
+                        f'mafafx_cache_requests_total{{{lbl},result="miss"}} {c["misses"]}']
+            out += ["# HELP mafafx_cache_entry_age_seconds Umur entri cache sejak dihitung terakhir.", "# TYPE mafafx_cache_entry_age_seconds gauge"]
+            for name, c in sorted(self._caches.items()):
+                out += [f'mafafx_cache_entry_age_seconds{{pid="{pid}",cache="{_label(name)}",entry="{_label(e)}"}} {now - ts:.1f}'
+                        for e, ts in c['entries'].items()]
+            out += ["# HELP mafafx_upstream_errors_total Error & timeout per sumber upstream.", "# TYPE mafafx_upstream_errors_total counter"]
+            out += [f'mafafx_upstream_errors_total{{pid="{pid}",source="{_label(s)}",kind="{_label(k)}"}} {n}'
+                    for (s, k), n in sorted(self._errors.items())]
+        out += [f'mafafx_process_start_time_seconds{{pid="{pid}"}} {self.started:.0f}']
+        return "\n".join(out) + "\n"
+
+    def export(self, path):
+        """Tulis atomik ke file .prom (satu file per proses, dibaca textfile collector)."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f: f.write(self.prometheus())
+        os.replace(tmp, path)
+
+METRICS = Metrics()
+span = METRICS.span
+record_error = METRICS.error
@@ -0,0 +1,66 @@
+import numpy as np
+
+# ==========================================
+# LOGIKA BIAS & SINYAL H1 (DIPAKAI DASHBOARD & BACKTEST)
+# ==========================================
+
+BIAS_PARAMS = {'dxy': 0.05, 'us10y': 0.5, 'rsi_hi': 60, 'rsi_lo': 40, 'strong': 3, 'z': 2.0}
+SIGNAL_PARAMS = {'dxy': 0.05, 'strength': 0.2}
+
+BIAS_LABELS = [("STRONG BUY", "#00CC96"), ("STRONG SELL", "#FF4B4B"), ("WEAK BUY", "#b2d8d8"), ("WEAK SELL", "#ffcccc"), ("NEUTRAL", "#FFFFFF")]
+
+def timeframe_params(params, hours):
+    """
+    Threshold perubahan % (dxy, us10y) disetel untuk bar H1. Untuk bar `hours` jam diskalakan akar waktu
+    (simpangan perubahan harga tumbuh kira-kira dengan akar panjang bar); threshold RSI, z & skor tetap.
+    """
+    k = float(np.sqrt(hours))
+    return {name: v * k if name in ('dxy', 'us10y') else v for name, v in params.items()}
+
+def usd_sign(symbol):
+    """+1 bila USD mata uang quote (XAU/USD), -1 bila base (USD/JPY), 0 untuk non-FX."""
+    if symbol.endswith("/USD"): return 1
+    if symbol.startswith("USD/"): return -1
+    return 0
+
+def bias_score(dxy_chg, us10y_chg, rsi, sign=1, dxy=0.05, us10y=0.5, rsi_hi=60, rsi_lo=40, z=None, z_thr=2.0):
+    """
+    Skor bias (vektor, mendukung broadcasting threshold berbentuk (k, 1) untuk sweep parameter).
+    z (opsional): z-score residual harga vs proxy DXY (rolling_stats); |z| > z_thr menambah +-1
+    (harga bergerak lebih jauh dari yang dijelaskan dolar). NaN/None = tanpa kontribusi.
+    """
+    d = np.asarray(dxy_chg, dtype=float); u = np.asarray(us10y_chg, dtype=float); r = np.asarray(rsi, dtype=float)
+    usd = np.where(d > dxy, -2, np.where(d < -dxy, 2, 0)) + np.where(u > us10y, -2, np.where(u < -us10y, 2, 0))
+    score = np.asarray(sign) * usd + np.where(r > rsi_hi, 1, np.where(r < rsi_lo, -1, 0))
+    if z is None: return score
+    z = np.asarray(z, dtype=float)
+    return score + np.where(z > z_thr, 1, np.where(z < -z_thr, -1, 0))
+
+def bias_class(score, strong=3):
+    """Indeks BIAS_LABELS: 0 STRONG BUY, 1 STRONG SELL, 2 WEAK BUY, 3 WEAK SELL, 4 NEUTRAL."""
+    score = np.asarray(score)
+    return np.select([score >= strong, score <= -strong, score > 0, score < 0], [0, 1, 2, 3], 4)
+
+def determine_bias(dxy_chg, us10y_chg, rsi, sign=1, params=BIAS_PARAMS, z=None):
+    """
+    Bias untuk satu simbol atau array simbol sekaligus. `sign` = usd_sign(symbol):
+    pengaruh DXY & yield dibalik untuk pair dengan USD sebagai base. `z`: lihat bias_score.
+    Return (text, color), atau list (text, color) bila input berupa array.
+    """
+    score = bias_score(dxy_chg, us10y_chg, rsi, sign, params['dxy'], params['us10y'], params['rsi_hi'], params['rsi_lo'],
+                       z, params['z'])
+    idx = bias_class(score, params['strong'])
+    if idx.ndim == 0: return BIAS_LABELS[int(idx)]
+    return [BIAS_LABELS[i] for i in idx]
+
+def signal_direction(dxy_chg, dxy=0.05):
+    """Arah sinyal H1 (vektor): +1 BUY saat dolar melemah, -1 SELL saat dolar menguat, 0 netral."""
+    d = np.asarray(dxy_chg, dtype=float)
+    return np.where(d > dxy, -1, np.where(d < -dxy, 1, 0))
+
+def h1_signal(dxy_chg, net_score, params=SIGNAL_PARAMS):
+    """Sinyal eksekusi H1: (signal, teks, warna)."""
+    direction = int(signal_direction(dxy_chg, params['dxy']))
+    if direction < 0: return "SELL", "JUAL KUAT 🔴" if net_score < -params['strength'] else "TEKANAN JUAL 🔴", "#FF4B4B"
+    if direction > 0: return "BUY", "BELI KUAT 🟢" if net_score > params['strength'] else "PELUANG BELI 🟢", "#00CC96"
+    return "NEUTRAL", "NEUTRAL (WAIT & SEE) ⚪", "#FFFFFF"
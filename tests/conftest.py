@@ -0,0 +1,8 @@
+import os
+import sys
+import tempfile
+
+# Modul aplikasi ada di root repo (tanpa paket)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Data runtime (snapshot, attempts, alert, token dicabut) ke direktori sementara, bukan .mafafx repo
+os.environ["MAFAFX_DATA_DIR"] = tempfile.mkdtemp(prefix="mafafx-test-")
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+from alerts import LocalNotifier, SignalAlerts, evaluate_closed_bar
+from indicators import rsi_series
+import dashboard
+
+# ==========================================
+# ALERT SINYAL: BASELINE, TRANSISI, DEDUP & 'SINCE'
+# ==========================================
+
+HOUR = 3600
+T0 = 1_704_700_800   # 2024-01-08 08:00 UTC = 15:00 WIB
+
+def snapshot(bar, dxy_c, rsi=50.0, us10y_chg=0.0, running_us10y=0.0):
+    """Snapshot minimal: view H1 dengan input bar close ke-`bar`; US10Y top-level = bar berjalan (tidak dipakai)."""
+    closed = {'ts': T0 + bar * HOUR, 'price': 2000.0 + bar, 'dxy_c': dxy_c, 'rsi': rsi, 'us10y_chg': us10y_chg}
+    return {'TF': {'H1': {'CLOSED': closed, 'CORR': None}}, 'US10Y': {'price': 4.0, 'chg': running_us10y}}
+
+@pytest.fixture
+def notifier():
+    return LocalNotifier()
+
+@pytest.fixture
+def make(tmp_path, notifier):
+    return lambda: SignalAlerts(str(tmp_path / "alerts.json"), [notifier])
+
+def test_closed_bar_uses_closed_inputs_not_running_bar():
+    up = evaluate_closed_bar(snapshot(0, dxy_c=-0.2, rsi=65.0, us10y_chg=-1.0, running_us10y=+5.0)['TF']['H1'])
+    assert up['signal'] == "BUY" and up['bias'] == "STRONG BUY"
+    assert up['bar'] == "2024-01-08 15:00" and up['rsi'] == 65.0
+    assert evaluate_closed_bar({'CLOSED': None}) is None
+
+def test_first_evaluation_is_baseline_without_alert(make, notifier):
+    status = make().process(snapshot(0, dxy_c=-0.2))
+    assert notifier.sent == []
+    assert status['last']['signal'] == "BUY"
+    assert status['since'] == {'signal': "2024-01-08 15:00", 'bias': "2024-01-08 15:00"}
+
+def test_transition_alerts_once_and_tracks_since(make, notifier):
+    alerts = make()
+    alerts.process(snapshot(0, dxy_c=-0.2))
+    alerts.process(snapshot(1, dxy_c=-0.3))   # sinyal sama: tanpa alert, 'since' tetap
+    status = alerts.process(snapshot(2, dxy_c=+0.2))
+    assert [(a['kind'], a['from'], a['to'], a['bar']) for a in notifier.sent] == [
+        ('signal', "BUY", "SELL", "2024-01-08 17:00"), ('bias', "WEAK BUY", "WEAK SELL", "2024-01-08 17:00")]
+    assert status['since']['signal'] == "2024-01-08 17:00"
+
+def test_same_bar_is_evaluated_once_across_restarts(make, notifier):
+    make().process(snapshot(0, dxy_c=-0.2))
+    make().process(snapshot(1, dxy_c=+0.2))
+    sent = len(notifier.sent)
+    status = make().process(snapshot(1, dxy_c=+0.2))   # proses lain / restart dengan snapshot sama
+    make().process(snapshot(0, dxy_c=-0.2))            # snapshot lebih lama tidak mengubah status
+    assert len(notifier.sent) == sent == 2
+    assert status['last']['bar'] == "2024-01-08 16:00"
+
+def test_failing_notifier_does_not_block_others(tmp_path, notifier):
+    class Broken:
+        name = "BROKEN"
+        def send(self, alert): raise RuntimeError("down")
+    alerts = SignalAlerts(str(tmp_path / "alerts.json"), [Broken(), notifier])
+    alerts.process(snapshot(0, dxy_c=-0.2)); alerts.process(snapshot(1, dxy_c=+0.2))
+    assert [a['kind'] for a in notifier.sent] == ['signal', 'bias']
+
+def test_closed_bar_inputs_match_engine_and_bar_close_yield(monkeypatch):
+    engines = {}; monkeypatch.setattr(dashboard, "get_indicator_engines", lambda: engines)
+    idx = pd.date_range("2024-01-08", periods=60, freq="h")
+    rng = np.random.default_rng(3)
+    gold = 2000 + np.cumsum(rng.normal(0, 2, 60)); usd = 1.08 + np.cumsum(rng.normal(0, 1e-3, 60))
+    bars = pd.concat({f: pd.DataFrame({"XAU/USD": gold + d, "EUR/USD": usd + d / 1000}, index=idx)
+                      for f, d in (('open', 0), ('high', 1), ('low', -1), ('close', 0))}, axis=1)
+    yields = pd.Series(4 + np.arange(60) / 100, index=idx + pd.Timedelta(hours=1))   # index = waktu close bar
+    dashboard.calculate_indicators(('H1', "XAU/USD"), bars.xs("XAU/USD", axis=1, level=1))
+    closed = dashboard.closed_bar_inputs('H1', bars, yields)
+    assert closed['ts'] == int(idx[-2].timestamp()) and closed['price'] == pytest.approx(gold[-2])
+    assert closed['rsi'] == pytest.approx(rsi_series(gold[:-1], (14,))[0, -1], abs=1e-9)
+    assert closed['dxy_c'] == pytest.approx(-(usd[-2] / usd[-3] - 1) * 100)
+    assert closed['us10y_chg'] == pytest.approx((yields.iloc[-2] / yields.iloc[-3] - 1) * 100)   # bukan bar berjalan
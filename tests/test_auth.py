@@ -0,0 +1,51 @@
+import time
+import pytest
+import auth
+
+# ==========================================
+# TOKEN SESI HMAC & PENCABUTAN
+# ==========================================
+
+USERS = {'mafa': "rahasia", 'budi': "sandi"}
+
+@pytest.fixture(autouse=True)
+def revoked(tmp_path, monkeypatch):
+    path = str(tmp_path / "revoked_tokens.txt"); registry = {'mtime': None, 'sigs': set()}
+    monkeypatch.setattr(auth, "REVOKED_TOKENS_PATH", path)
+    monkeypatch.setattr(auth, "get_revoked_tokens", lambda: registry)
+    return path
+
+def test_valid_token_roundtrip():
+    assert auth.verify_session_token(auth.get_session_token('mafa', USERS['mafa']), USERS) == 'mafa'
+
+@pytest.mark.parametrize("token", ["", "a.b", "a.b.c.d", "!!!.123.sig", None])
+def test_malformed_token_rejected(token):
+    assert auth.verify_session_token(token, USERS) is None
+
+def test_expired_token_rejected():
+    assert auth.verify_session_token(auth.get_session_token('mafa', USERS['mafa'], ttl=-1), USERS) is None
+
+def test_password_change_or_removed_user_invalidates_token():
+    token = auth.get_session_token('mafa', USERS['mafa'])
+    assert auth.verify_session_token(token, {**USERS, 'mafa': "baru"}) is None
+    assert auth.verify_session_token(token, {'budi': USERS['budi']}) is None
+
+def test_tampered_user_or_expiry_rejected():
+    user_b64, exp, sig = auth.get_session_token('budi', USERS['budi']).split(".")
+    other_b64 = auth.get_session_token('mafa', USERS['mafa']).split(".")[0]
+    assert auth.verify_session_token(f"{other_b64}.{exp}.{sig}", USERS) is None
+    assert auth.verify_session_token(f"{user_b64}.{int(exp) + 3600}.{sig}", USERS) is None
+
+def test_revoked_token_rejected_others_still_valid():
+    token = auth.get_session_token('mafa', USERS['mafa']); other = auth.get_session_token('budi', USERS['budi'])
+    assert auth.verify_session_token(token, USERS) == 'mafa'   # daftar cabut sudah dibaca (cache per mtime)
+    auth.revoke_session_token(token)
+    assert auth.verify_session_token(token, USERS) is None
+    assert auth.verify_session_token(other, USERS) == 'budi'
+
+def test_revocation_from_other_process_seen_and_expired_entries_dropped(revoked):
+    token = auth.get_session_token('mafa', USERS['mafa'])
+    sig = token.rsplit(".", 1)[1]
+    with open(revoked, "w") as f: f.write(f"stale {int(time.time()) - 1}\n{sig} {int(time.time()) + 60}\n")
+    assert auth.verify_session_token(token, USERS) is None
+    assert auth.get_revoked_tokens()['sigs'] == {sig}
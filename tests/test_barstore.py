@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+from barstore import BarStore, format_ts
+import dashboard
+
+# ==========================================
+# BAR STORE: CELAH, BACKFILL & JALUR GAGAL SYNC
+# ==========================================
+
+SYMBOLS = ["XAU/USD", "EUR/USD"]
+START = pd.Timestamp("2024-01-08 00:00")   # Senin
+
+def values(hours):
+    """Format 'values' Twelve Data untuk jam ke-`hours` sejak START."""
+    return [{'datetime': str(START + pd.Timedelta(hours=h)), 'open': 1.0, 'high': 2.0, 'low': 0.5, 'close': 1.5,
+             'volume': 0.0} for h in hours]
+
+class FakeUpstream:
+    """get_twelvedata pengganti: catat tiap request, balas dari `reply(symbols, params)`."""
+    def __init__(self, reply):
+        self.reply = reply; self.calls = []
+
+    def __call__(self, symbols, interval, api_key, timeout=10, **params):
+        self.calls.append((list(symbols), params)); return self.reply(symbols, params)
+
+@pytest.fixture
+def store(tmp_path):
+    return BarStore(str(tmp_path / "bars.sqlite"))
+
+@pytest.fixture
+def env(monkeypatch, store, tmp_path):
+    attempts = {}
+    monkeypatch.setattr(dashboard, "get_bar_store", lambda: store)
+    monkeypatch.setattr(dashboard, "get_seed_attempts", lambda: attempts)
+    monkeypatch.setattr(dashboard, "get_last_good", lambda: {})
+    monkeypatch.setattr(dashboard, "get_source_attempts", lambda: dashboard.SourceAttempts(str(tmp_path / "attempts.json")))
+    def install(reply):
+        upstream = FakeUpstream(reply); monkeypatch.setattr(dashboard, "get_twelvedata", upstream); return upstream
+    return attempts, install
+
+def test_gaps_skip_weekend_and_honor_mark_checked(store):
+    store.upsert("XAU/USD", "1h", values([0, 1, 5, 6]))   # celah Senin 02:00-04:00
+    store.upsert("EUR/USD", "1h", values([115, 116, 166, 167]))   # Jumat 20:00 -> Minggu 22:00: pasar tutup
+    assert store.gaps("EUR/USD", "1h") == []
+    gap = (int((START + pd.Timedelta(hours=1)).timestamp()), int((START + pd.Timedelta(hours=5)).timestamp()))
+    assert store.gaps("XAU/USD", "1h") == [gap]
+    store.mark_checked("XAU/USD", "1h", [gap])
+    assert store.gaps("XAU/USD", "1h") == []
+
+def test_failed_seed_batch_backs_off_every_symbol(env):
+    attempts, install = env
+    upstream = install(lambda symbols, params: None)   # mis. API key salah / rate limit
+    assert dashboard.sync_bars(SYMBOLS, "1h", "key") is None
+    assert set(attempts) == {(s, "1h") for s in SYMBOLS}
+    assert dashboard.sync_bars(SYMBOLS, "1h", "key") is None
+    assert len(upstream.calls) == 1   # rerun dalam BARSTORE_SEED_RETRY tidak mengirim seed 5000 bar lagi
+
+def test_seed_retried_after_backoff(env):
+    attempts, install = env
+    install(lambda symbols, params: None)
+    dashboard.sync_bars(SYMBOLS, "1h", "key")
+    for k in attempts: attempts[k] -= dashboard.BARSTORE_SEED_RETRY
+    upstream = install(lambda symbols, params: {s: values(range(30)) for s in symbols})
+    frame = dashboard.sync_bars(SYMBOLS, "1h", "key")
+    assert len(upstream.calls) == 1 and len(frame) == 30 and not attempts
+
+def test_failed_incremental_falls_back_to_store_as_stale(env, store):
+    _, install = env
+    for s in SYMBOLS: store.upsert(s, "1h", values(range(30)))
+    upstream = install(lambda symbols, params: None)
+    assert dashboard.sync_bars(SYMBOLS, "1h", "key") is None
+    assert upstream.calls[0][1]['start_date'] == format_ts(store.last_ts(SYMBOLS[0], "1h"))
+    # Setelah restart belum ada nilai terakhir di memori: riwayat tersimpan dipakai, status stale
+    results, status = dashboard.fetch_sources(
+        {'BARS': (dashboard.sync_bars, (SYMBOLS, "1h", "key"))},
+        fallback={'BARS': lambda: dashboard.stored_bars(SYMBOLS, "1h")})
+    assert status['BARS']['state'] == 'stale'
+    assert len(results['BARS']) == 30
+    np.testing.assert_array_equal(results['BARS']['close'][SYMBOLS].to_numpy(), 1.5)
+
+def test_stored_bars_empty_store_is_none(env):
+    assert dashboard.stored_bars(SYMBOLS, "1h") is None
+
+def test_gap_marked_checked_only_after_successful_backfill(env, store):
+    _, install = env
+    for s in SYMBOLS: store.upsert(s, "1h", values([0, 1, 5, 6]))
+    fail_backfill = lambda symbols, params: None if 'end_date' in params else {s: [] for s in symbols}
+    install(fail_backfill)
+    dashboard.sync_bars(SYMBOLS, "1h", "key")
+    assert store.gaps(SYMBOLS[0], "1h")   # gagal: dicoba lagi siklus berikutnya
+    install(lambda symbols, params: {s: values([2, 3, 4]) if 'end_date' in params else [] for s in symbols})
+    dashboard.sync_bars(SYMBOLS, "1h", "key")
+    assert not store.gaps(SYMBOLS[0], "1h")
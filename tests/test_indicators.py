@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+from engine import calculate_rsi
+from indicators import IndicatorEngine, atr_series, ema_series, rsi_series
+from metrics import METRICS
+
+# ==========================================
+# PARITAS ENGINE INDIKATOR VS IMPLEMENTASI LOOP LAMA
+# ==========================================
+
+def legacy_rsi(prices, period=14):
+    """calculate_rsi versi loop sebelum engine vektor (seri penuh, bukan hanya nilai terakhir)."""
+    prices = np.array(prices).astype(float)
+    deltas = np.diff(prices)
+    seed = deltas[:period + 1]
+    up = seed[seed >= 0].sum() / period
+    down = -seed[seed < 0].sum() / period
+    rsi = np.zeros_like(prices)
+    with np.errstate(divide='ignore'):
+        rsi[:period] = 100. - 100. / (1. + up / down)
+        for i in range(period, len(prices)):
+            delta = deltas[i - 1]
+            upval, downval = (delta, 0.) if delta > 0 else (0., -delta)
+            up = (up * (period - 1) + upval) / period
+            down = (down * (period - 1) + downval) / period
+            rsi[i] = 100. - 100. / (1. + up / down)
+    return rsi
+
+def legacy_calculate_rsi(prices, period=14):
+    prices = np.array(prices).astype(float)
+    if len(prices) < period + 1: return 50.0
+    seed = np.diff(prices)[:period + 1]
+    if -seed[seed < 0].sum() == 0: return 100.0
+    return legacy_rsi(prices, period)[-1]
+
+def ema_loop(x, p):
+    out = np.full(len(x), np.nan)
+    if len(x) < p: return out
+    out[p - 1] = np.mean(x[:p])
+    for i in range(p, len(x)): out[i] = out[i - 1] + 2.0 / (p + 1) * (x[i] - out[i - 1])
+    return out
+
+def atr_loop(high, low, close, p):
+    tr = [high[0] - low[0]] + [max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+                               for i in range(1, len(close))]
+    out = np.full(len(close), np.nan)
+    if len(close) < p: return out
+    out[p - 1] = np.mean(tr[:p])
+    for i in range(p, len(close)): out[i] = (out[i - 1] * (p - 1) + tr[i]) / p
+    return out
+
+@pytest.fixture
+def bars():
+    rng = np.random.default_rng(7)
+    close = 2000 + np.cumsum(rng.normal(0, 3, 600))
+    spread = np.abs(rng.normal(0, 2, 600))
+    return close + spread, close - spread, close
+
+@pytest.mark.parametrize("prices", [
+    [], [2000.0], list(np.linspace(2000, 2010, 14)),              # lebih pendek dari period + 1
+    [2000.0] * 50,                                                # datar
+    list(np.linspace(2000, 2100, 50)), list(np.linspace(2100, 2000, 50)),   # naik / turun monoton
+    list(2000 + np.cumsum(np.random.default_rng(1).normal(0, 3, 300))),
+])
+def test_calculate_rsi_matches_legacy(prices):
+    assert calculate_rsi(prices) == pytest.approx(legacy_calculate_rsi(prices), abs=1e-9)
+
+def test_calculate_rsi_bad_input_is_neutral_and_counted():
+    errors = lambda: sum(r['count'] for r in METRICS.error_rows() if r['source'] == "RSI")
+    before = errors()
+    assert calculate_rsi(["x"] * 20) == 50.0
+    assert errors() == before + 1
+
+@pytest.mark.parametrize("period", range(2, 51))
+def test_rsi_series_matches_legacy_loop(bars, period):
+    close = bars[2]
+    np.testing.assert_allclose(rsi_series(close, (period,))[0], legacy_rsi(close, period), rtol=0, atol=1e-9)
+    assert calculate_rsi(close, period) == pytest.approx(legacy_calculate_rsi(close, period), abs=1e-9)
+
+def test_rsi_series_many_periods_at_once(bars):
+    close = bars[2]; periods = tuple(range(2, 51))
+    out = rsi_series(close, periods)
+    for row, p in zip(out, periods):
+        np.testing.assert_allclose(row, legacy_rsi(close, p), rtol=0, atol=1e-9)
+
+def test_rsi_series_short_input_is_neutral():
+    np.testing.assert_array_equal(rsi_series(np.arange(10.0), (14,)), np.full((1, 10), 50.0))
+
+@pytest.mark.parametrize("periods", [(2,), (20, 50), (9, 12, 26, 200)])
+def test_ema_series_matches_recurrence(bars, periods):
+    close = bars[2]
+    for row, p in zip(ema_series(close, periods), periods):
+        np.testing.assert_allclose(row, ema_loop(close, p), rtol=0, atol=1e-9, equal_nan=True)
+
+@pytest.mark.parametrize("periods", [(2,), (14,), (7, 14, 50)])
+def test_atr_series_matches_recurrence(bars, periods):
+    high, low, close = bars
+    for row, p in zip(atr_series(high, low, close, periods), periods):
+        np.testing.assert_allclose(row, atr_loop(high, low, close, p), rtol=0, atol=1e-9, equal_nan=True)
+
+@pytest.mark.parametrize("split", [60, 300, 599])
+def test_engine_update_matches_compute(bars, split):
+    high, low, close = bars
+    inc = IndicatorEngine()
+    inc.compute(high[:split], low[:split], close[:split])
+    for i in range(split, len(close)): got = inc.update(high[i], low[i], close[i])
+    full = IndicatorEngine(); full.compute(high, low, close)
+    want = full.values()
+    for name in ('rsi', 'ema', 'atr', 'macd'):
+        for k, v in want[name].items(): assert got[name][k] == pytest.approx(v, abs=1e-9), (name, k)
+
+def test_engine_update_without_commit_keeps_state(bars):
+    high, low, close = bars
+    engine = IndicatorEngine(); engine.compute(high[:-1], low[:-1], close[:-1])
+    before = engine.values()
+    running = engine.update(high[-1], low[-1], close[-1], commit=False)
+    assert engine.values() == before
+    assert running == engine.update(high[-1], low[-1], close[-1])
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+from levels import key_levels, last_closed
+
+# ==========================================
+# PIVOT DARI PERIODE ACUAN TERAKHIR YANG SUDAH CLOSE
+# ==========================================
+
+@pytest.fixture
+def daily():
+    """3 periode D1 x 2 simbol; simbol kedua tanpa bar pada periode kedua."""
+    high = np.array([[110.0, 12.0], [120.0, np.nan], [130.0, 14.0]])
+    low = np.array([[90.0, 8.0], [100.0, np.nan], [115.0, 11.0]])
+    close = np.array([[100.0, 10.0], [105.0, np.nan], [125.0, 13.0]])
+    end = np.array([86400, 2 * 86400, 3 * 86400])
+    return high, low, close, end
+
+def test_last_closed_skips_running_period(daily):
+    h, l, c = last_closed(*daily, now=2 * 86400 + 3600)   # periode ketiga masih berjalan
+    np.testing.assert_array_equal(h, [120.0, 12.0])
+    np.testing.assert_array_equal(l, [100.0, 8.0])
+    np.testing.assert_array_equal(c, [105.0, 10.0])   # simbol kedua: periode close terakhir yang ada barnya
+
+def test_last_closed_without_closed_period_is_nan(daily):
+    assert all(np.isnan(a).all() for a in last_closed(*daily, now=0))
+
+def test_pivots_use_previous_period_not_window(daily):
+    prev = last_closed(*daily, now=2 * 86400)
+    intraday = np.full((24, 2), 200.0)   # bar timeframe aktif jauh dari periode sebelumnya
+    levels = key_levels(intraday, intraday, intraday, prev, atr=[5.0, 1.0])
+    H, L, C = 120.0, 100.0, 105.0; P = (H + L + C) / 3
+    assert levels['classic']['P'][0] == pytest.approx(P)
+    assert levels['classic']['R1'][0] == pytest.approx(2 * P - L)
+    assert levels['camarilla']['R1'][0] == pytest.approx(C + (H - L) * 1.1 / 12)
+    assert levels['atr']['S2'][0] == pytest.approx(P - 10.0)
+    assert levels['range']['P'][0] == 200.0
@@ -0,0 +1,125 @@
+import time
+import pandas as pd
+import pytest
+from barstore import BarStore
+import dashboard
+
+# ==========================================
+# REFRESH: BACKOFF PER SUMBER & JADWAL POLLER
+# ==========================================
+
+class Clock:
+    """Pengganti modul time di dashboard: time() dikendalikan test, fungsi lain diteruskan."""
+    def __init__(self, t=1_700_000_000.0):
+        self.t = t
+
+    def time(self):
+        return self.t
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+class FakeCalendar:
+    """CalendarStore pengganti: sync() hanya menghubungi 'upstream' bila sudah due (seperti aslinya)."""
+    def __init__(self, clock):
+        self.clock = clock; self.checked = float('-inf'); self.calls = 0
+
+    def sync(self, timeout=10, min_interval=900):
+        if self.clock.t - self.checked < min_interval: return None
+        self.checked = self.clock.t; self.calls += 1
+        return False
+
+    def expire(self):
+        self.checked = float('-inf')
+
+    def __len__(self):
+        return 1
+
+    def day(self, *args):
+        return pd.DataFrame({'title': ["CPI"]})
+
+    week = day
+
+@pytest.fixture
+def attempts(tmp_path):
+    return dashboard.SourceAttempts(str(tmp_path / "attempts.json"))
+
+def test_due_never_attempted_then_by_data_age(attempts, monkeypatch):
+    clock = Clock(); monkeypatch.setattr(dashboard, "time", clock)
+    assert attempts.due({'BARS': 60}) == ['BARS']
+    attempts.record({'BARS': True})
+    assert attempts.due({'BARS': 60}, now=clock.t + 59) == []
+    assert attempts.due({'BARS': 60}, now=clock.t + 60) == ['BARS']
+
+def test_due_backs_off_after_consecutive_failures(attempts, monkeypatch):
+    clock = Clock(); monkeypatch.setattr(dashboard, "time", clock)
+    gap = 60
+    for failures in range(1, 7):
+        attempts.record({'BARS': False}); start = clock.t
+        wait = min(gap * 2 ** failures, dashboard.REFRESH_BACKOFF_MAX)
+        assert attempts.due({'BARS': gap}, now=start + wait - 1) == []
+        assert attempts.due({'BARS': gap}, now=start + wait) == ['BARS']
+        clock.t = start + wait
+    attempts.record({'BARS': True})
+    assert attempts.due({'BARS': gap}, now=clock.t + gap) == ['BARS']   # sukses: backoff direset
+
+@pytest.fixture
+def poller(tmp_path, monkeypatch, attempts):
+    """MarketPoller dengan build_market_snapshot asli, sumber upstream & analisis diganti stub."""
+    clock = Clock(); calendar = FakeCalendar(clock)
+    store = BarStore(str(tmp_path / "bars.sqlite"))
+    store.upsert("XAU/USD", "1h", [{'datetime': str(pd.Timestamp("2024-01-08") + pd.Timedelta(hours=h)),
+                                    'open': 1, 'high': 2, 'low': 0.5, 'close': 1.5, 'volume': 0} for h in range(48)])
+    calls = {'BARS': 0, 'M15': 0, 'US10Y': 0}
+    def sync_bars(symbols, interval, api_key, lookback=dashboard.BAR_LOOKBACK, timeout=10):
+        calls['BARS' if interval == "1h" else 'M15'] += 1
+        return store.load_frame(["XAU/USD"], "1h")
+    def us10y(timeout=10):
+        calls['US10Y'] += 1
+        return {'price': 4.0, 'chg': 0.1, 'series': pd.Series([4.0], index=[pd.Timestamp("2024-01-08")])}
+    monkeypatch.setattr(dashboard, "time", clock)
+    monkeypatch.setattr(dashboard.st, "secrets", {"twelvedata": {"api_key": "key"}})
+    monkeypatch.setattr(dashboard, "sync_bars", sync_bars)
+    monkeypatch.setattr(dashboard, "get_us10y_data", us10y)
+    monkeypatch.setattr(dashboard, "get_calendar_store", lambda: calendar)
+    monkeypatch.setattr(dashboard, "get_source_attempts", lambda: attempts)
+    last_good = {}; monkeypatch.setattr(dashboard, "get_last_good", lambda: last_good)
+    monkeypatch.setattr(dashboard, "analyze_timeframe", lambda tf, *args: {'TIMEFRAME': tf})
+    monkeypatch.setattr(dashboard, "analyze_sessions", lambda *args: {})
+    monkeypatch.setattr(dashboard, "get_signal_alerts", lambda: type("Off", (), {'process': lambda self, data: None})())
+    dashboard.fetch_news.clear()
+    p = dashboard.MarketPoller(path=str(tmp_path / "snapshot.pkl"))
+    return p, clock, calendar, calls
+
+def test_scheduled_poll_keeps_every_source_refreshable(poller):
+    p, clock, calendar, calls = poller
+    start = clock.t
+    p.refresh()
+    assert p.snapshot is not None and calendar.calls == 1 and p.due_sources() == []
+    clock.t = start + 90
+    assert p.due_sources() == ['BARS', 'M15']
+    clock.t = start + 150
+    assert p.due_sources() == ['BARS', 'M15', 'US10Y']
+    # Poll terjadwal: cache fetch_news habis tapi kalender belum due -> tanpa request, bukan percobaan NEWS
+    clock.t = start + 300; dashboard.fetch_news.clear()
+    p.refresh(wait=False)
+    assert calendar.calls == 1 and calls['BARS'] == 2
+    clock.t = start + dashboard.REFRESH_MIN_INTERVAL['NEWS']
+    assert 'NEWS' in p.due_sources()
+    # Refresh manual NEWS: kalender direvalidasi (conditional GET) dan umur datanya kembali nol
+    p.refresh(force=True, wait=False, sources=['NEWS'])
+    assert calendar.calls == 2 and calls['BARS'] == 2
+    assert 'NEWS' not in p.due_sources()
+
+def test_failed_build_backs_off_instead_of_refetching(poller, monkeypatch):
+    p, clock, calendar, calls = poller
+    def sync_bars(symbols, interval, *args, **kw): calls['BARS' if interval == "1h" else 'M15'] += 1   # upstream gagal: None
+    monkeypatch.setattr(dashboard, "sync_bars", sync_bars)
+    monkeypatch.setattr(dashboard, "stored_bars", lambda *args, **kw: None)
+    start = clock.t
+    for _ in range(4): p.refresh()   # render pertama + rerun sesi / tick poller
+    assert p.snapshot is None and calls['BARS'] == 1
+    clock.t = start + p.interval * 2 - 1; p.refresh()
+    assert calls['BARS'] == 1
+    clock.t = start + p.interval * 2; p.refresh()
+    assert calls['BARS'] == 2